@@ -0,0 +1,142 @@
+import concurrent.futures as cf
+import multiprocessing as mp
+import importlib
+import argparse
+import zipfile
+import json
+import glob
+import sys
+import re
+import os
+from datetime import datetime
+
+# 여러 학생의 제출 파일(JSON)로 보고서 PDF를 한꺼번에 만들 때 쓰는 프로세스 수
+WORKERS = int(os.environ.get("BATCH_EXPORT_WORKERS", str(os.cpu_count() or 2)))
+# 제출 파일에서 보고서를 다시 만들 수 있는 수업 (각 모듈에 pdf_from_submission이 있어야 함)
+LESSONS = {3: "data3", 4: "data4", 5: "data5", 7: "data7"}
+
+def submission_json(day, **fields):
+    """수업 화면에서 내려받는 제출 파일(JSON) 내용"""
+    record = {"day": day, "saved_at": datetime.now().isoformat(timespec="seconds"), **fields}
+    return json.dumps(record, ensure_ascii=False, indent=2)
+
+def parse_submissions(data):
+    """제출 파일 내용(bytes/str)을 제출물 목록으로 변환 (파일 하나에 목록이 들어 있어도 됨)"""
+    if isinstance(data, bytes):
+        data = data.decode("utf-8-sig")
+    data = json.loads(data)
+    return data if isinstance(data, list) else [data]
+
+def parse_files(files, failed):
+    """(파일 이름, 내용) 쌍에서 제출물을 하나씩 읽어 냄 (읽지 못한 파일은 failed에 (이름, 오류)로 기록)"""
+    for name, data in files:
+        try:
+            submissions = parse_submissions(data)
+        except ValueError as e:
+            # JSONDecodeError·UnicodeDecodeError 모두 ValueError
+            failed.append((name, f"{e.__class__.__name__}: {e}"))
+            continue
+        yield from submissions
+
+def _read_paths(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            yield from _read_paths(sorted(glob.glob(os.path.join(path, "*.json"))))
+            continue
+        with open(path, "rb") as f:
+            yield path, f.read()
+
+def load_submissions(paths, failed):
+    """JSON 파일·폴더 경로에서 제출물을 하나씩 읽어 냄 (읽지 못한 파일은 failed에 기록)"""
+    return parse_files(_read_paths(paths), failed)
+
+def _render(submission):
+    # 작업 프로세스에서 실행: 수업 모듈은 프로세스마다 처음 한 번만 import됨
+    day = int(submission["day"])
+    if day not in LESSONS:
+        raise ValueError(f"{day}일차 제출물은 보고서로 만들 수 없습니다.")
+    return importlib.import_module(LESSONS[day]).pdf_from_submission(submission)
+
+def report_filename(submission):
+    if not isinstance(submission, dict):
+        raise ValueError("제출물은 JSON 객체({...})여야 합니다.")
+    info = submission.get("student_info") or {}
+    if not isinstance(info, dict):
+        raise ValueError("student_info는 JSON 객체여야 합니다.")
+    parts = [f"Day{submission.get('day', '')}", info.get("id", ""), info.get("name", "")]
+    name = "_".join(p for p in (str(part).strip() for part in parts) if p)
+    return re.sub(r'[\\/:*?"<>|\s]+', "_", name) + ".pdf"
+
+def _unique(name, used):
+    stem, ext = os.path.splitext(name)
+    candidate, i = name, 1
+    while candidate in used:
+        i += 1
+        candidate = f"{stem}_{i}{ext}"
+    used.add(candidate)
+    return candidate
+
+def export_zip(submissions, out, workers=WORKERS, max_in_flight=None, on_progress=None, failed=None):
+    """제출물마다 보고서 PDF를 프로세스 풀에서 만들어 끝나는 순서대로 ZIP(out: 경로나 파일 객체)에 씀
+
+    동시에 처리 중인 작업을 max_in_flight개(기본 workers의 2배)로 제한해 PDF를 한꺼번에 메모리에 쌓지 않음.
+    실패한 제출물은 건너뛰고 errors.txt에 기록 (failed에 파일을 읽을 때 난 오류 목록을 넘기면 함께 기록).
+    on_progress(n)에는 처리를 마친 제출물 수를 넘김. 반환값은 {"written": 성공 수, "failed": [(이름, 오류)]}
+    """
+    max_in_flight = max_in_flight or 2 * workers
+    methods = mp.get_all_start_methods()
+    ctx = mp.get_context("forkserver" if "forkserver" in methods else "spawn")
+    summary = {"written": 0, "failed": failed if failed is not None else []}
+    processed = 0
+    used = set()
+    pending = {}
+
+    def progress():
+        nonlocal processed
+        processed += 1
+        if on_progress:
+            on_progress(processed)
+
+    def collect(done, archive):
+        for future in done:
+            name = pending.pop(future)
+            try:
+                archive.writestr(_unique(name, used), future.result())
+                summary["written"] += 1
+            except Exception as e:
+                summary["failed"].append((name, f"{e.__class__.__name__}: {e}"))
+            progress()
+
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as archive, \
+            cf.ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as executor:
+        for i, submission in enumerate(submissions, 1):
+            try:
+                name = report_filename(submission)
+            except Exception as e:
+                summary["failed"].append((f"제출물 {i}", f"{e.__class__.__name__}: {e}"))
+                progress()
+                continue
+            if len(pending) >= max_in_flight:
+                done, _ = cf.wait(pending, return_when=cf.FIRST_COMPLETED)
+                collect(done, archive)
+            pending[executor.submit(_render, submission)] = name
+        collect(cf.as_completed(list(pending)), archive)
+        if summary["failed"]:
+            archive.writestr("errors.txt", "\n".join(f"{name}\t{error}" for name, error in summary["failed"]))
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="제출 파일(JSON)로 학급 보고서 PDF를 한 번에 만들어 ZIP으로 저장")
+    parser.add_argument("paths", nargs="+", help="제출 파일(.json) 또는 제출 파일이 있는 폴더")
+    parser.add_argument("-o", "--output", default="reports.zip", help="저장할 ZIP 파일 (기본: reports.zip)")
+    parser.add_argument("-j", "--workers", type=int, default=WORKERS, help="PDF를 만들 프로세스 수")
+    args = parser.parse_args(argv)
+    failed = []
+    summary = export_zip(load_submissions(args.paths, failed), args.output, workers=args.workers, failed=failed)
+    print(f"{args.output}: 보고서 {summary['written']}개 저장, 실패 {len(summary['failed'])}개")
+    for name, error in summary["failed"]:
+        print(f"  {name}: {error}", file=sys.stderr)
+    return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+import functools
+import threading
+import weakref
+import sys
+import io
+import os
+import streamlit as st
+from lazy import lazy_import
+from lru import LRUCache
+
+np = lazy_import("numpy")
+mpl = lazy_import("matplotlib")
+mpl_collections = lazy_import("matplotlib.collections")
+alt = lazy_import("altair")
+pd = lazy_import("pandas")
+mpl_figure = lazy_import("matplotlib.figure")
+backend_agg = lazy_import("matplotlib.backends.backend_agg")
+
+# 차트 그리기 방식: "matplotlib"(서버에서 이미지로 그림, 기본) 또는 "altair"(데이터만 보내 브라우저에서 그림)
+BACKEND = os.environ.get("CHART_BACKEND", "matplotlib")
+# 닫지 않고 다시 쓰기 위해 보관해 둘 Figure 수: 한 화면에 동시에 그리는 그래프 수보다 조금 많게
+POOL_SIZE = int(os.environ.get("FIGURE_POOL_SIZE", "8"))
+# 렌더링한 PNG를 보관할 그래프 수: 한 장에 수십 KB라 기본값이면 십몇 MB 안쪽
+PNG_CACHE_SIZE = int(os.environ.get("CHART_CACHE_SIZE", "256"))
+# 그래프 하나에 그리는 최대 점 수 (넘으면 LTTB로 모양을 유지하며 줄임)
+PLOT_MAX_POINTS = int(os.environ.get("PLOT_MAX_POINTS", "2000"))
+
+_lock = threading.Lock()
+_pool = []
+_live = weakref.WeakSet()
+_counts = {"created": 0, "reused": 0, "released": 0}
+
+def _reset(fig, figsize):
+    fig.clear()
+    fig.set_size_inches(figsize)
+    fig.set_facecolor(mpl.rcParams["figure.facecolor"])
+    # tight_layout이 바꿔 둔 여백을 기본값으로 되돌림
+    fig.subplotpars.update(**{
+        name: mpl.rcParams[f"figure.subplot.{name}"]
+        for name in ("left", "right", "bottom", "top", "wspace", "hspace")
+    })
+
+def new_figure(figsize=None):
+    """pyplot 전역 목록에 등록되지 않는 Agg Figure와 Axes를 반환 (보관된 Figure가 있으면 재사용)"""
+    figsize = figsize or tuple(mpl.rcParams["figure.figsize"])
+    with _lock:
+        fig = _pool.pop() if _pool else None
+        _counts["reused" if fig is not None else "created"] += 1
+    if fig is None:
+        fig = mpl_figure.Figure(figsize=figsize)
+        backend_agg.FigureCanvasAgg(fig)
+    else:
+        _reset(fig, figsize)
+    with _lock:
+        _live.add(fig)
+    return fig, fig.add_subplot()
+
+def release_figure(fig):
+    """다 쓴 Figure를 비우고 풀에 돌려놓음 (풀이 가득 차면 그냥 버려 GC가 회수)"""
+    fig.clear()
+    with _lock:
+        if fig not in _live:
+            return
+        _live.discard(fig)
+        _counts["released"] += 1
+        if len(_pool) < POOL_SIZE:
+            _pool.append(fig)
+
+def show_figure(fig, release=True, **kwargs):
+    """Figure를 화면에 그린 뒤 바로 반환 (PDF 등에 다시 쓸 Figure는 release=False)"""
+    st.pyplot(fig, **kwargs)
+    if release:
+        release_figure(fig)
+
+def vertical_segments(ax, x, y_from, y_to, linestyle="--", **kwargs):
+    """x마다 y_from→y_to 세로 선분(편차·차이)을 점 개수와 관계없이 하나의 LineCollection으로 그림"""
+    x = np.asarray(x, dtype=float).ravel()
+    starts = np.column_stack([x, np.asarray(y_from, dtype=float).ravel()])
+    ends = np.column_stack([x, np.asarray(y_to, dtype=float).ravel()])
+    segments = mpl_collections.LineCollection(np.stack([starts, ends], axis=1), linestyle=linestyle, **kwargs)
+    ax.add_collection(segments)
+    ax.autoscale_view()
+    return segments
+
+def lttb_indices(x, y, n_out):
+    """x 순으로 정렬된 점에서 n_out개를 고른 인덱스 (Largest-Triangle-Three-Buckets)
+
+    양 끝 점을 두고 나머지를 n_out-2개 구간으로 나눈 뒤, 구간마다 직전에 고른 점·다음 구간의 평균점과
+    만드는 삼각형이 가장 큰 점을 고름 (급격한 변화와 극값이 남아 그래프 모양이 유지됨)
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    bounds = np.append(edges, n)
+    picked = np.empty(n_out, dtype=int)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = bounds[i], bounds[i + 1]
+        next_x = x[hi:bounds[i + 2]].mean()
+        next_y = y[hi:bounds[i + 2]].mean()
+        area = np.abs((x[a] - next_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y - y[a]))
+        a = lo + int(area.argmax())
+        picked[i + 1] = a
+    return picked
+
+def downsample(x, y, max_points=PLOT_MAX_POINTS):
+    """점이 max_points개를 넘으면 LTTB로 고른 원래 배열의 인덱스를, 아니면 None을 반환 (인덱스는 x 순)"""
+    x = np.asarray(x, dtype=float).ravel()
+    y = np.asarray(y, dtype=float).ravel()
+    if len(x) <= max_points:
+        return None
+    order = np.argsort(x, kind="stable")
+    return order[lttb_indices(x[order], y[order], max_points)]
+
+def figure_png(fig, dpi=200):
+    """st.pyplot과 같은 설정(dpi 200, 여백 자동)으로 Figure를 PNG 바이트로 변환"""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+    return buffer.getvalue()
+
+_png_cache = LRUCache(maxsize=PNG_CACHE_SIZE)
+
+def cached_chart(figsize=None):
+    """draw(fig, ax, *args)로 그리는 차트를 입력값 기준으로 PNG 캐시 (세션 간 공유, LRU)"""
+    def decorator(draw):
+        @functools.wraps(draw)
+        def render(*args):
+            # 2와 2.0처럼 값은 같아도 그림(라벨)이 달라지는 경우를 구분하기 위해 자료형도 키에 포함
+            key = (draw.__module__, draw.__qualname__, tuple((type(a).__name__, a) for a in args))
+            png = _png_cache.get(key)
+            if png is None:
+                fig, ax = new_figure(figsize)
+                try:
+                    draw(fig, ax, *args)
+                    png = figure_png(fig)
+                finally:
+                    release_figure(fig)
+                _png_cache.put(key, png)
+            return png
+        return render
+    return decorator
+
+def use_altair():
+    return BACKEND == "altair"
+
+class AltairChart:
+    """matplotlib 차트와 같은 구성(실제값·추세선·편차·예측점)을 데이터만 보내 Vega-Lite로 그리는 차트"""
+
+    def __init__(self, title="", x_title="x", y_title="y"):
+        self.title = title
+        self.x_title = x_title
+        self.y_title = y_title
+        self._domain = []
+        self._range = []
+        self._layers = []
+
+    def _frame(self, label, **columns):
+        frame = pd.DataFrame({name: np.asarray(values, dtype=float).ravel() for name, values in columns.items()})
+        frame["series"] = label
+        return frame
+
+    def _add(self, label, color, build):
+        # 범례에 쓸 이름과 색을 모아 두었다가 show()에서 한 번에 색 척도로 만듦
+        if label not in self._domain:
+            self._domain.append(label)
+            self._range.append(color)
+        self._layers.append(build)
+        return self
+
+    def _encode(self, chart, color, **extra):
+        return chart.encode(
+            x=alt.X("x:Q", title=self.x_title, scale=alt.Scale(zero=False)),
+            y=alt.Y("y:Q", title=self.y_title, scale=alt.Scale(zero=False)),
+            color=color, tooltip=["series:N", "x:Q", "y:Q"], **extra
+        )
+
+    def points(self, x, y, label, color, size=90, shape="circle"):
+        data = self._frame(label, x=x, y=y)
+        mark = dict(filled=True, size=size, shape=shape, stroke="white", strokeWidth=1.5, opacity=1)
+        return self._add(label, color, lambda c: self._encode(alt.Chart(data).mark_point(**mark), c))
+
+    def line(self, x, y, label, color, dash=None, width=2.2, marker=None):
+        data = self._frame(label, x=x, y=y)
+        mark = dict(strokeWidth=width)
+        if marker:
+            mark["point"] = alt.OverlayMarkDef(shape=marker, size=70, filled=True)
+        if dash:
+            mark["strokeDash"] = list(dash)
+        return self._add(label, color, lambda c: self._encode(alt.Chart(data).mark_line(**mark), c))
+
+    def segments(self, x, y_from, y_to, label, color, dash=(4, 3), width=1.2, opacity=0.7):
+        data = self._frame(label, x=x, y=y_from, y2=y_to)
+        mark = dict(strokeDash=list(dash), strokeWidth=width, opacity=opacity)
+        return self._add(label, color, lambda c: self._encode(alt.Chart(data).mark_rule(**mark), c, y2="y2:Q"))
+
+    def bars(self, x, x2, y, label, color, y0=0, opacity=1.0, stroke="black"):
+        data = self._frame(label, x=x, x2=x2, y=y, y0=np.full(len(np.ravel(x)), y0))
+        mark = dict(opacity=opacity, stroke=stroke, strokeWidth=1)
+        return self._add(label, color, lambda c: self._encode(alt.Chart(data).mark_rect(**mark), c, x2="x2:Q", y2="y0:Q"))
+
+    def text(self, x, y, text, color="black", dx=0, dy=0, **mark_kwargs):
+        data = pd.DataFrame({"x": np.ravel(x).astype(float), "y": np.ravel(y).astype(float), "text": np.ravel(text)})
+        mark = dict(color=color, dx=dx, dy=dy, align="left", fontSize=13)
+        mark.update(mark_kwargs)
+        self._layers.append(lambda c: alt.Chart(data).mark_text(**mark).encode(x="x:Q", y="y:Q", text="text:N"))
+        return self
+
+    def chart(self, height=380):
+        color = alt.Color(
+            "series:N", scale=alt.Scale(domain=self._domain, range=self._range),
+            legend=alt.Legend(title=None, orient="top-left")
+        )
+        layers = [build(color) for build in self._layers]
+        if not layers:
+            layers = [self._encode(alt.Chart(self._frame("", x=[], y=[])).mark_point(), color)]
+        return alt.layer(*layers).properties(title=self.title, height=height)
+
+    def show(self, height=380):
+        st.altair_chart(self.chart(height), use_container_width=True)
+
+def figure_stats():
+    with _lock:
+        stats = dict(_counts, live=len(_live), pooled=len(_pool))
+    stats["png_cache"] = _png_cache.stats()
+    # pyplot을 거쳐 만든 Figure가 남아 있는지도 함께 확인
+    pyplot = sys.modules.get("matplotlib.pyplot")
+    stats["pyplot_open"] = len(pyplot.get_fignums()) if pyplot else 0
+    return stats
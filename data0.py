@@ -1,23 +1,10 @@
 import streamlit as st
 from streamlit_ace import st_ace
-import pandas as pd
-import io
-import sys
+from runner import run_code
+from mdtable import markdown_table
 
 def code_runner(code_input):
-    output_buffer = io.StringIO()
-    result, status = "", "success"
-    try:
-        sys.stdout = output_buffer
-        exec_globals = {}
-        exec(code_input, exec_globals)
-        result = output_buffer.getvalue() or "출력된 내용이 없습니다."
-    except Exception as e:
-        result = f"{e.__class__.__name__}: {e}"
-        status = "error"
-    finally:
-        sys.stdout = sys.__stdout__
-    return result, status
+    return run_code(code_input)
 
 def display_output(result, status):
     if status == "success":
@@ -173,9 +160,8 @@ def show():
                 "제곱 (2의 3제곱)"
             ]
         }
-        df = pd.DataFrame(data)
         st.subheader("🧮 파이썬 사칙연산 정리표")
-        st.dataframe(df, use_container_width=True)
+        st.markdown(markdown_table(data, code_columns=("연산자", "예시 코드")))
         st.markdown(""" ###### 💻 :blue[[문제 2]] 아래와 같이 숫자의 연산을 출력해보세요""")
         code_block(2, "연산 출력", "print('5+7=', 5+7)\nprint('5**2=', 5**2)", prefix="d1_")
         st.markdown("<hr style='border: 2px solid #2196F3;'>", unsafe_allow_html=True)
@@ -1,23 +1,9 @@
 import streamlit as st
 from streamlit_ace import st_ace
-import io
-import sys
+from runner import run_code
 
 def code_runner(code_input):
-    output_buffer = io.StringIO()
-    result = ""
-    status = "success"
-    try:
-        sys.stdout = output_buffer
-        exec_globals = {}
-        exec(code_input, exec_globals)
-        result = output_buffer.getvalue() or "출력된 내용이 없습니다."
-    except Exception as e:
-        result = f"{e.__class__.__name__}: {e}"
-        status = "error"
-    finally:
-        sys.stdout = sys.__stdout__
-    return result, status
+    return run_code(code_input)
 
 def display_output(result, status):
     if status == "success":
@@ -1,41 +1,21 @@
 import streamlit as st
 from streamlit_ace import st_ace
-from fpdf import FPDF
-from datetime import datetime
+from runner import run_code
+from charts import AltairChart, new_figure, show_figure, use_altair, vertical_segments
+from fonts import register_korean_font
+import report
+import batch_export
+import pdf_jobs
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib as mpl
-import matplotlib.font_manager as fm
-import tempfile
 import pandas as pd
-import io
-import sys
-import os
 
 try:
-    font_path = os.path.join(os.path.dirname(__file__), "font", "NanumGothic.ttf")
-    fm.fontManager.addfont(font_path)  
-    font_name = fm.FontProperties(fname=font_path).get_name()
-    mpl.rc('font', family=font_name)   
-    mpl.rc('axes', unicode_minus=False) 
+    register_korean_font()
 except Exception as e:
     st.warning(f"⚠️ 한글 폰트 로드 실패: {e}. 기본 폰트로 진행합니다.")
     
 def code_runner(code_input):
-    output_buffer = io.StringIO()
-    result = ""
-    status = "success"
-    try:
-        sys.stdout = output_buffer
-        exec_globals = {}
-        exec(code_input, exec_globals)
-        result = output_buffer.getvalue() or "출력된 내용이 없습니다."
-    except Exception as e:
-        result = f"{e.__class__.__name__}: {e}"
-        status = "error"
-    finally:
-        sys.stdout = sys.__stdout__
-    return result, status
+    return run_code(code_input)
 
 def display_output(result, status):
     if status == "success":
@@ -65,81 +45,29 @@ def code_block_columns(problem_number, starter_code, prefix=""):
             result, status = code_runner(code_input)
             display_output(result, status)
 
-class ThemedPDF(FPDF):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.alias_nb_pages()
-        self.set_auto_page_break(auto=True, margin=15)
-
-        font_path = os.path.join(os.path.dirname(__file__), "font", "NanumGothic.ttf")
-        self.add_font("Nanum", "", font_path, uni=True)  
-        self._font_family = "Nanum"  # 기본 폰트를 나눔고딕으로 지정
-        self.footer_left = ""
-
-        self.c_primary = (25, 118, 210)
-        self.c_primary_lt = (227, 242, 253)
-        self.c_border = (200, 200, 200)
-        self.c_text_muted = (120, 120, 120)
-
-    def header(self):
-        self.set_fill_color(*self.c_primary)
-        self.rect(0, 0, self.w, 20, 'F')
-        self.set_xy(10, 6)
-        self.set_text_color(255, 255, 255)
-        self.set_font(self._font_family, '', 16)
-        self.cell(0, 10, "나만의 등차수열 문제 만들기", ln=1, align='C')
-        self.set_text_color(33, 33, 33)
-        self.ln(15)
-
-    def footer(self):
-        self.set_y(-15)
-        self.set_draw_color(*self.c_border)
-        self.line(10, self.get_y(), self.w - 10, self.get_y())
-        self.set_y(-12)
-        self.set_font(self._font_family, '', 9)
-        self.set_text_color(*self.c_text_muted)
-        if self.footer_left:
-            self.cell(0, 8, self.footer_left, 0, 0, 'L')
-        self.cell(0, 8, f"{self.page_no()} / {{nb}}", 0, 0, 'R')
-
-    def h2(self, text):
-        self.set_fill_color(*self.c_primary_lt)
-        self.set_text_color(21, 101, 192)
-        self.set_font(self._font_family, '', 12)
-        self.cell(0, 9, text, ln=1, fill=True)
-        self.ln(2)
-        self.set_text_color(33, 33, 33)
-
-    def p(self, text, size=11, lh=6):
-        self.set_font(self._font_family, '', size)
-        self.multi_cell(0, lh, text)
-        self.ln(1)
-
 def create_custom_pdf(student_info, problem_text, code, result,
                       alg_decomp="", alg_steps=None, alg_validation=""):
-    pdf = ThemedPDF()
-    pdf.set_font("Helvetica", '', 12)
-    pdf.footer_left = f"{student_info.get('school','')} • {student_info.get('name','')}"
-    pdf.add_page()
-    pdf.h2("👤 학생 정보")
-    pdf.p(f"학교: {student_info.get('school','')}")
-    pdf.p(f"학번: {student_info.get('id','')}")
-    pdf.p(f"이름: {student_info.get('name','')}")
-    pdf.p(f"작성일: {datetime.now().strftime('%Y-%m-%d')}")
-    pdf.h2("📝 문제 설명")
-    pdf.p(problem_text if problem_text else "작성된 문제 설명 없음")
-    pdf.h2("알고리즘적 사고")
-    pdf.p("문제 분해:")
-    pdf.p(alg_decomp)
-    pdf.p("절차화:")
-    pdf.p("\n".join([f"{i+1}. {s}" for i, s in enumerate(alg_steps or []) if s.strip()]))
-    pdf.p("검증 및 일반화:")
-    pdf.p(alg_validation)
-    pdf.h2("💻 작성 코드")
-    pdf.p(code)
-    pdf.h2("📤 실행 결과")
-    pdf.p(result)
-    return bytes(pdf.output(dest='S'))
+    steps = "\n".join([f"{i+1}. {s}" for i, s in enumerate(alg_steps or []) if s.strip()])
+    return report.build_report({
+        "title": "나만의 등차수열 문제 만들기",
+        "footer": report.footer_text(student_info),
+        "sections": [
+            report.student_info(student_info),
+            report.text("📝 문제 설명", problem_text if problem_text else "작성된 문제 설명 없음"),
+            report.text("알고리즘적 사고", "문제 분해:", alg_decomp, "절차화:", steps,
+                        "검증 및 일반화:", alg_validation),
+            report.text("💻 작성 코드", code),
+            report.text("📤 실행 결과", result),
+        ],
+    })
+
+def pdf_from_submission(submission):
+    """저장해 둔 제출 파일(JSON)로 보고서를 다시 만듦 (batch_export에서 사용)"""
+    return create_custom_pdf(
+        submission.get("student_info", {}), submission.get("problem_text", ""),
+        submission.get("code", ""), submission.get("result", ""),
+        submission.get("alg_decomp", ""), submission.get("alg_steps"), submission.get("alg_validation", ""),
+    )
 
 # ✅ 메인 화면
 def show():
@@ -180,32 +108,38 @@ def show():
             n_values = np.arange(1, n_max+1)
             y_values = [eval(formula, {"n": int(n)}) for n in n_values]
             st.write(f"👉 생성된 수열: {y_values}")
-            fig, ax = plt.subplots(figsize=(7, 5))
-            ax.scatter(
-                n_values, y_values,
-                color='#1976d2', edgecolors='white', linewidths=1.5,
-                s=100, marker='o', label="수열 값 (a_n)", zorder=3
-            )
-            ax.plot(
-                n_values, y_values,
-                color='#ff9800', linestyle='--', linewidth=2.2,
-                label="수열 추세선", zorder=2
-            )
-            ax.set_title(
-                f"수열 시각화: $a_n = {formula}$",
-                fontsize=15, fontweight='bold', color='#1976d2', pad=15
-            )
-            ax.set_xlabel("항 번호 (n)", fontsize=13, fontweight='bold')
-            ax.set_ylabel("a_n (값)", fontsize=13, fontweight='bold')
-            ax.grid(alpha=0.25, linestyle="--")
-            leg = ax.legend(
-                fontsize=9, loc='upper left', frameon=True, fancybox=True, framealpha=0.88, shadow=True,
-                borderpad=1, labelspacing=0.8
-            )
-            for line in leg.get_lines():
-                line.set_linewidth(3.0)
-            plt.tight_layout()
-            st.pyplot(fig)
+            if use_altair():
+                chart = AltairChart(f"수열 시각화: a_n = {formula}", "항 번호 (n)", "a_n (값)")
+                chart.line(n_values, y_values, "수열 추세선", "#ff9800", dash=(6, 4))
+                chart.points(n_values, y_values, "수열 값 (a_n)", "#1976d2", size=100)
+                chart.show()
+            else:
+                fig, ax = new_figure(figsize=(7, 5))
+                ax.scatter(
+                    n_values, y_values,
+                    color='#1976d2', edgecolors='white', linewidths=1.5,
+                    s=100, marker='o', label="수열 값 (a_n)", zorder=3
+                )
+                ax.plot(
+                    n_values, y_values,
+                    color='#ff9800', linestyle='--', linewidth=2.2,
+                    label="수열 추세선", zorder=2
+                )
+                ax.set_title(
+                    f"수열 시각화: $a_n = {formula}$",
+                    fontsize=15, fontweight='bold', color='#1976d2', pad=15
+                )
+                ax.set_xlabel("항 번호 (n)", fontsize=13, fontweight='bold')
+                ax.set_ylabel("a_n (값)", fontsize=13, fontweight='bold')
+                ax.grid(alpha=0.25, linestyle="--")
+                leg = ax.legend(
+                    fontsize=9, loc='upper left', frameon=True, fancybox=True, framealpha=0.88, shadow=True,
+                    borderpad=1, labelspacing=0.8
+                )
+                for line in leg.get_lines():
+                    line.set_linewidth(3.0)
+                fig.tight_layout()
+                show_figure(fig)
         except Exception as e:
             st.error(f"❌ 식을 계산할 수 없습니다: {e}")
         col1, col2 = st.columns(2)
@@ -250,41 +184,50 @@ def show():
         col1, col2 = st.columns(2)
         with col1: show_seq1 = st.checkbox("수열 1 보이기", value=True)
         with col2: show_seq2 = st.checkbox("수열 2 보이기", value=True)
-        fig, ax = plt.subplots(figsize=(7, 5))
-        if show_seq1:
-            ax.plot(
-                n_values, y1,
-                marker="o", markersize=8, markeredgecolor="white", markeredgewidth=1.5,
-                color="#1976d2", linewidth=2.2,
-                label=fr"수열1: $a_n = {a1_1} + (n-1)\times{d1}$", zorder=3
-            )
-        if show_seq2:
-            ax.plot(
-                n_values, y2,
-                marker="s", markersize=8, markeredgecolor="white", markeredgewidth=1.5,
-                color="#d32f2f", linewidth=2.2,
-                label=fr"수열2: $a_n = {a1_2} + (n-1)\times{d2}$", zorder=3
-            )
-        if show_seq1 and show_seq2:
-            for n, v1, v2 in zip(n_values, y1, y2):
-                ax.plot([n, n], [v1, v2], "--", color="gray", alpha=0.6, linewidth=1.2)
-        ax.set_title(
-            "두 등차수열 비교",
-            fontsize=16, fontweight="bold", color="#1976d2", pad=15
-        )
-        ax.set_xlabel("n (항 번호)", fontsize=13, fontweight="bold")
-        ax.set_ylabel("a_n (값)", fontsize=13, fontweight="bold")
-        ax.grid(alpha=0.25, linestyle="--")
-        handles, labels = ax.get_legend_handles_labels()
-        if labels:
-            leg = ax.legend(
-                fontsize=9, loc="upper left",
-                frameon=True, fancybox=True, shadow=True, framealpha=0.9
+        if use_altair():
+            chart = AltairChart("두 등차수열 비교", "n (항 번호)", "a_n (값)")
+            if show_seq1:
+                chart.line(n_values, y1, f"수열1: a_n = {a1_1} + (n-1)×{d1}", "#1976d2", marker="circle")
+            if show_seq2:
+                chart.line(n_values, y2, f"수열2: a_n = {a1_2} + (n-1)×{d2}", "#d32f2f", marker="square")
+            if show_seq1 and show_seq2:
+                chart.segments(n_values, y1, y2, "차이", "gray", opacity=0.6)
+            chart.show()
+        else:
+            fig, ax = new_figure(figsize=(7, 5))
+            if show_seq1:
+                ax.plot(
+                    n_values, y1,
+                    marker="o", markersize=8, markeredgecolor="white", markeredgewidth=1.5,
+                    color="#1976d2", linewidth=2.2,
+                    label=fr"수열1: $a_n = {a1_1} + (n-1)\times{d1}$", zorder=3
+                )
+            if show_seq2:
+                ax.plot(
+                    n_values, y2,
+                    marker="s", markersize=8, markeredgecolor="white", markeredgewidth=1.5,
+                    color="#d32f2f", linewidth=2.2,
+                    label=fr"수열2: $a_n = {a1_2} + (n-1)\times{d2}$", zorder=3
+                )
+            if show_seq1 and show_seq2:
+                vertical_segments(ax, n_values, y1, y2, color="gray", alpha=0.6, linewidth=1.2)
+            ax.set_title(
+                "두 등차수열 비교",
+                fontsize=16, fontweight="bold", color="#1976d2", pad=15
             )
-            for line in leg.get_lines():
-                line.set_linewidth(3.0)
-        plt.tight_layout()
-        st.pyplot(fig)
+            ax.set_xlabel("n (항 번호)", fontsize=13, fontweight="bold")
+            ax.set_ylabel("a_n (값)", fontsize=13, fontweight="bold")
+            ax.grid(alpha=0.25, linestyle="--")
+            handles, labels = ax.get_legend_handles_labels()
+            if labels:
+                leg = ax.legend(
+                    fontsize=9, loc="upper left",
+                    frameon=True, fancybox=True, shadow=True, framealpha=0.9
+                )
+                for line in leg.get_lines():
+                    line.set_linewidth(3.0)
+            fig.tight_layout()
+            show_figure(fig)
         df = pd.DataFrame({
             "항 번호 (n)": n_values,
             f"수열1 (a₁={a1_1}, d={d1})": y1,
@@ -407,13 +350,20 @@ def show():
         student_info = {"school": school, "id": student_id, "name": student_name}
         if st.button("📥 PDF 저장하기"):
             result = st.session_state.get("last_result", "실행 결과 없음")
-            pdf_bytes = create_custom_pdf(student_info, student_problem, user_code, result,alg_decomp, alg_steps, alg_validation)
-            st.download_button(
-                label="📄 PDF 다운로드",
-                data=pdf_bytes,
-                file_name=f"Day3_Report_{student_name}.pdf",
-                mime="application/pdf"
-            )
+            pdf_jobs.request(st.session_state, "pdf_job_d3", create_custom_pdf,
+                             student_info, student_problem, user_code, result, alg_decomp, alg_steps, alg_validation)
+        pdf_jobs.show_download(st.session_state, "pdf_job_d3", "📄 PDF 다운로드", f"Day3_Report_{student_name}.pdf")
+        st.download_button(
+            label="💾 제출 파일(JSON) 저장",
+            data=batch_export.submission_json(
+                3, student_info=student_info, problem_text=student_problem, code=user_code,
+                result=st.session_state.get("last_result", "실행 결과 없음"),
+                alg_decomp=alg_decomp, alg_steps=alg_steps, alg_validation=alg_validation,
+            ),
+            file_name=f"Day3_Submission_{student_name}.json",
+            mime="application/json",
+            key="submission_json_d3"
+        )
         st.markdown(
         """
         <style>
@@ -1,34 +1,17 @@
 import streamlit as st
 from streamlit_ace import st_ace
-from fpdf import FPDF
-from datetime import datetime
+from runner import run_code
+from charts import AltairChart, cached_chart, use_altair
+from fonts import register_korean_font
+import report
+import batch_export
+import pdf_jobs
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib as mpl
-import matplotlib.font_manager as fm
-import tempfile
-import pandas as pd
-import io
-import sys
-import os
 
-font_path = os.path.join(os.path.dirname(__file__), "font/NanumGothic.ttf")
-fm.fontManager.addfont(font_path)  
-font_name = fm.FontProperties(fname=font_path).get_name()
-mpl.rc('font', family=font_name)   
-mpl.rc('axes', unicode_minus=False) 
+register_korean_font()
 
 def code_runner(code_input):
-    output_buffer = io.StringIO()
-    try:
-        sys.stdout = output_buffer
-        exec_globals = {}
-        exec(code_input, exec_globals)
-        return output_buffer.getvalue() or "출력된 내용이 없습니다.", "success"
-    except Exception as e:
-        return f"{e.__class__.__name__}: {e}", "error"
-    finally:
-        sys.stdout = sys.__stdout__
+    return run_code(code_input)
 
 def display_output(result, status):
     if status == "success":
@@ -58,79 +41,75 @@ def code_block_columns(problem_number, starter_code, prefix=""):
             result, status = code_runner(code_input)
             display_output(result, status)
 
-class ThemedPDF(FPDF):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.alias_nb_pages()
-        self.set_auto_page_break(auto=True, margin=15)
-        font_path = os.path.join(os.path.dirname(__file__), "font", "NanumGothic.ttf")
-        self.add_font("Nanum", "", font_path, uni=True) 
-        self._font_family = "Nanum"  
-        self.footer_left = ""
-        self.c_primary = (25, 118, 210)
-        self.c_primary_lt = (227, 242, 253)
-        self.c_border = (200, 200, 200)
-        self.c_text_muted = (120, 120, 120)
-
-    def header(self):
-        self.set_fill_color(*self.c_primary)
-        self.rect(0, 0, self.w, 20, 'F')
-        self.set_xy(10, 6)
-        self.set_text_color(255, 255, 255)
-        self.set_font(self._font_family, '', 16)
-        self.cell(0, 10, "나만의 수열의 합 문제 만들기", ln=1, align='C')
-        self.set_text_color(33, 33, 33)
-        self.ln(15)
-
-    def footer(self):
-        self.set_y(-15)
-        self.set_draw_color(*self.c_border)
-        self.line(10, self.get_y(), self.w - 10, self.get_y())
-        self.set_y(-12)
-        self.set_font(self._font_family, '', 9)
-        self.set_text_color(*self.c_text_muted)
-        if self.footer_left:
-            self.cell(0, 8, self.footer_left, 0, 0, 'L')
-        self.cell(0, 8, f"{self.page_no()} / {{nb}}", 0, 0, 'R')
+def create_custom_pdf(student_info, problem_text, code, result,
+                      alg_decomp="", alg_steps=None, alg_validation=""):
+    steps = "\n".join([f"{i+1}. {s}" for i, s in enumerate(alg_steps or []) if s.strip()])
+    return report.build_report({
+        "title": "나만의 수열의 합 문제 만들기",
+        "footer": report.footer_text(student_info),
+        "sections": [
+            report.student_info(student_info),
+            report.text("📝 문제 설명", problem_text if problem_text else "작성된 문제 설명 없음"),
+            report.text("알고리즘적 사고", "문제 분해:", alg_decomp, "절차화:", steps,
+                        "검증 및 일반화:", alg_validation),
+            report.text("💻 작성 코드", code),
+            report.text("📤 실행 결과", result),
+        ],
+    })
 
-    def h2(self, text):
-        self.set_fill_color(*self.c_primary_lt)
-        self.set_text_color(21, 101, 192)
-        self.set_font(self._font_family, '', 12)
-        self.cell(0, 9, text, ln=1, fill=True)
-        self.ln(2)
-        self.set_text_color(33, 33, 33)
+def pdf_from_submission(submission):
+    """저장해 둔 제출 파일(JSON)로 보고서를 다시 만듦 (batch_export에서 사용)"""
+    return create_custom_pdf(
+        submission.get("student_info", {}), submission.get("problem_text", ""),
+        submission.get("code", ""), submission.get("result", ""),
+        submission.get("alg_decomp", ""), submission.get("alg_steps"), submission.get("alg_validation", ""),
+    )
 
-    def p(self, text, size=11, lh=6):
-        self.set_font(self._font_family, '', size)
-        self.multi_cell(0, lh, text)
-        self.ln(1)
+@cached_chart(figsize=(7, 4))
+def arithmetic_sum_chart(fig, ax, a1, d, n, show_sequence, show_sum):
+    terms = [a1 + i*d for i in range(n)]
+    an = terms[-1]
+    if show_sequence:
+        ax.bar(np.arange(0, n), terms, width=1, align="edge", 
+            color="skyblue", edgecolor="black", label="수열의 항")
+    if show_sum:
+        rect_x = [0, n, n, 0, 0]
+        rect_y = [0, 0, a1+an, a1+an, 0]
+        ax.plot(rect_x, rect_y, color="red", linestyle="--", linewidth=2)
+        ax.fill_between([0, n], 0, a1+an, color="orange", alpha=0.2, label="직사각형 (합의 2배)")
+        ax.plot([0, n], [0, a1+an], color="purple", linestyle="-.", linewidth=2, label="대각선 (절반)")
+        ax.annotate(
+            f"(밑변) = n = {n}",
+            xy=(n/2, 2),
+            ha="center", va="top",
+            fontsize=11, color="black"
+        )
+        ax.annotate(
+            f"(높이) = a+a_n ={a1+an}",
+            xy=(0.4, (a1+an)/2),
+            ha="right", va="center",
+            fontsize=11, color="black", rotation=90
+        )
+    ax.set_xlim(0, n)
+    ax.set_ylim(0, a1+an+5)
+    ax.set_xlabel("항 번호 (n)")
+    ax.set_ylabel("a_n (값)")
+    ax.set_title("등차수열의 합 시각화")
+    ax.legend(loc="upper left")
 
-def create_custom_pdf(student_info, problem_text, code, result,
-                      alg_decomp="", alg_steps=None, alg_validation=""):
-    pdf = ThemedPDF()
-    pdf.set_font("Helvetica", '', 12)
-    pdf.footer_left = f"{student_info.get('school','')} • {student_info.get('name','')}"
-    pdf.add_page()
-    pdf.h2("👤 학생 정보")
-    pdf.p(f"학교: {student_info.get('school','')}")
-    pdf.p(f"학번: {student_info.get('id','')}")
-    pdf.p(f"이름: {student_info.get('name','')}")
-    pdf.p(f"작성일: {datetime.now().strftime('%Y-%m-%d')}")
-    pdf.h2("📝 문제 설명")
-    pdf.p(problem_text if problem_text else "작성된 문제 설명 없음")
-    pdf.h2("알고리즘적 사고")
-    pdf.p("문제 분해:")
-    pdf.p(alg_decomp)
-    pdf.p("절차화:")
-    pdf.p("\n".join([f"{i+1}. {s}" for i, s in enumerate(alg_steps or []) if s.strip()]))
-    pdf.p("검증 및 일반화:")
-    pdf.p(alg_validation)
-    pdf.h2("💻 작성 코드")
-    pdf.p(code)
-    pdf.h2("📤 실행 결과")
-    pdf.p(result)
-    return bytes(pdf.output(dest='S'))
+def arithmetic_sum_altair(a1, d, n, show_sequence, show_sum):
+    terms = [a1 + i*d for i in range(n)]
+    an = terms[-1]
+    chart = AltairChart("등차수열의 합 시각화", "항 번호 (n)", "a_n (값)")
+    if show_sum:
+        chart.bars([0], [n], [a1+an], "직사각형 (합의 2배)", "orange", opacity=0.2, stroke="red")
+    if show_sequence:
+        chart.bars(np.arange(0, n), np.arange(1, n+1), terms, "수열의 항", "skyblue")
+    if show_sum:
+        chart.line([0, n], [0, a1+an], "대각선 (절반)", "purple", dash=(8, 3, 2, 3), width=2)
+        chart.text([n/2], [0], [f"(밑변) = n = {n}"], dy=-12, align="center")
+        chart.text([0], [(a1+an)/2], [f"(높이) = a+a_n ={a1+an}"], dx=14, angle=270, align="center")
+    return chart
 
 # ✅ 메인 화면
 def show():
@@ -187,35 +166,10 @@ def show():
             show_sequence = st.checkbox("📊 수열 보기", value=True)
         with c2:
             show_sum = st.checkbox("🟧 수열의 합(직사각형) 보기", value=True)
-        fig, ax = plt.subplots(figsize=(7,4))
-        if show_sequence:
-            ax.bar(np.arange(0, n), terms, width=1, align="edge", 
-                color="skyblue", edgecolor="black", label="수열의 항")
-        if show_sum:
-            rect_x = [0, n, n, 0, 0]
-            rect_y = [0, 0, a1+an, a1+an, 0]
-            ax.plot(rect_x, rect_y, color="red", linestyle="--", linewidth=2)
-            ax.fill_between([0, n], 0, a1+an, color="orange", alpha=0.2, label="직사각형 (합의 2배)")
-            ax.plot([0, n], [0, a1+an], color="purple", linestyle="-.", linewidth=2, label="대각선 (절반)")
-            ax.annotate(
-                f"(밑변) = n = {n}",
-                xy=(n/2, 2),
-                ha="center", va="top",
-                fontsize=11, color="black"
-            )
-            ax.annotate(
-                f"(높이) = a+a_n ={a1+an}",
-                xy=(0.4, (a1+an)/2),
-                ha="right", va="center",
-                fontsize=11, color="black", rotation=90
-            )
-        ax.set_xlim(0, n)
-        ax.set_ylim(0, a1+an+5)
-        ax.set_xlabel("항 번호 (n)")
-        ax.set_ylabel("a_n (값)")
-        ax.set_title("등차수열의 합 시각화")
-        ax.legend(loc="upper left")
-        st.pyplot(fig)
+        if use_altair():
+            arithmetic_sum_altair(a1, d, n, show_sequence, show_sum).show()
+        else:
+            st.image(arithmetic_sum_chart(a1, d, n, show_sequence, show_sum))
         st.markdown("<hr style='border: 2px solid #2196F3;'>", unsafe_allow_html=True)
 
     with tabs[1]:
@@ -352,14 +306,20 @@ def show():
         student_info = {"school": school, "id": student_id, "name": student_name}
         if st.button("📥 PDF 저장하기", key="save_pdf_d5"):
             result = st.session_state.get("last_result", "실행 결과 없음")
-            pdf_bytes = create_custom_pdf(student_info, student_problem, user_code, result,
-                                        alg_decomp, alg_steps, alg_validation)
-            st.download_button(
-                label="📄 PDF 다운로드",
-                data=pdf_bytes,
-                file_name=f"Day5_Report_{student_name}.pdf",
-                mime="application/pdf"
-            )
+            pdf_jobs.request(st.session_state, "pdf_job_d5", create_custom_pdf,
+                             student_info, student_problem, user_code, result, alg_decomp, alg_steps, alg_validation)
+        pdf_jobs.show_download(st.session_state, "pdf_job_d5", "📄 PDF 다운로드", f"Day5_Report_{student_name}.pdf")
+        st.download_button(
+            label="💾 제출 파일(JSON) 저장",
+            data=batch_export.submission_json(
+                5, student_info=student_info, problem_text=student_problem, code=user_code,
+                result=st.session_state.get("last_result", "실행 결과 없음"),
+                alg_decomp=alg_decomp, alg_steps=alg_steps, alg_validation=alg_validation,
+            ),
+            file_name=f"Day5_Submission_{student_name}.json",
+            mime="application/json",
+            key="submission_json_d5"
+        )
         st.markdown(
         """
         <style>
@@ -1,125 +1,42 @@
 import streamlit as st
 import numpy as np
-import matplotlib
-import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import PolynomialFeatures
-from sklearn.preprocessing import MinMaxScaler
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import Dense
-from tensorflow.keras.optimizers import Adam
-from sklearn.metrics import mean_squared_error, r2_score
-from fpdf import FPDF
-from datetime import datetime
-import tempfile
-import itertools
-import os
+from lazy import lazy_import
+from charts import AltairChart, new_figure, show_figure, use_altair, vertical_segments
+from fonts import FONT_PATH, register_korean_font
+from mlp import DL_BACKEND, NumpyMLP
+from model_cache import model_key, get_model, put_model
+from regression import MinMaxScaler, fit_polynomial, gd_trace, poly_latex, r2_score
 import pandas as pd
-import itertools
+import report
+import pdf_jobs
 
-font_path = os.path.join(os.path.dirname(__file__), "font/NanumGothic.ttf")
-fm.fontManager.addfont(font_path)
-font_name = fm.FontProperties(fname=font_path).get_name()
-matplotlib.rcParams['font.family'] = font_name
-matplotlib.rcParams['axes.unicode_minus'] = False
+# 무거운 의존성은 실제로 쓰일 때 불러옵니다.
+keras = lazy_import("tensorflow.keras")
 
-def poly_equation_to_latex(model, poly):
-    terms = poly.get_feature_names_out(['x'])
-    coefs = model.coef_
-    intercept = model.intercept_
-    eq_terms = []
-    for t, c in zip(terms, coefs):
-        if abs(c) < 1e-8:  
-            continue
-        if t == "x":
-            term = f"{c:.2f}x"
-        elif "^" in t:
-            deg = t.split("^")[1]
-            term = f"{c:.2f}x^{{{deg}}}"   
-        else:
-            term = f"{c:.2f}{t}"
-        eq_terms.append(term)
-
-    if abs(intercept) > 1e-8:
-        eq_terms.append(f"{intercept:.2f}")
-
-    equation = " + ".join(eq_terms)
-    equation = equation.replace("+ -", "- ")
-    return f"y = {equation}"
-
-class ThemedPDF(FPDF):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.alias_nb_pages()
-        self.set_auto_page_break(auto=True, margin=15)
-        self._font_family = "Nanum"
-        self.footer_left = ""  
-        self.c_primary = (25, 118, 210) 
-        self.c_primary_lt = (227, 242, 253)
-        self.c_border = (200, 200, 200)
-        self.c_text_muted = (120, 120, 120)
+font_path = FONT_PATH
+register_korean_font()
 
-    def header(self):
-        self.set_fill_color(*self.c_primary)
-        self.rect(0, 0, self.w, 22, 'F')
-        self.set_xy(10, 6)
-        self.set_text_color(255, 255, 255)
-        self.set_font(self._font_family, '', 20)
-        self.cell(0, 10, "인공지능 수열 예측 보고서", ln=1, align='C')
-        self.set_text_color(33, 33, 33)
-        self.ln(18)
-
-    def footer(self):
-        self.set_y(-15)
-        self.set_draw_color(*self.c_border)
-        self.line(10, self.get_y(), self.w - 10, self.get_y())
-        self.set_y(-12)
-        self.set_font(self._font_family, '', 9)
-        self.set_text_color(*self.c_text_muted)
-        if self.footer_left:
-            self.cell(0, 8, self.footer_left, 0, 0, 'L')
-        self.cell(0, 8, f"{self.page_no()} / {{nb}}", 0, 0, 'R')
-
-    def h2(self, text):
-        self.set_fill_color(*self.c_primary_lt)
-        self.set_text_color(21, 101, 192)
-        self.set_font(self._font_family, '', 12)
-        self.cell(0, 9, text, ln=1, fill=True)
-        self.ln(2)
-        self.set_text_color(33, 33, 33)
-
-    def p(self, text, size=11, lh=6):
-        self.set_font(self._font_family, '', size)
-        self.multi_cell(0, lh, text)
-        self.ln(1)
+# "반복 학습과 오차" 탭에서 미리 계산해 둘 최대 epoch 수
+GD_MAX_EPOCHS = 100
 
 def create_pdf(student_info, analysis, latex_equation_ml, pred_ml_next, 
-               x, y, y_pred, next_input, fig=None):
-    pdf = ThemedPDF()
-    pdf.add_font('Nanum', '', font_path, uni=True)
-    pdf.set_font('Nanum', '', 12)
-    pdf._font_family = "Nanum"
-    pdf.footer_left = f"{student_info.get('school','')} • {student_info.get('name','')}"
-    pdf.add_page()
-    pdf.h2("👤 학생 정보")
-    pdf.p(f"학교: {student_info.get('school','')}")
-    pdf.p(f"학번: {student_info.get('id','')}")
-    pdf.p(f"이름: {student_info.get('name','')}")
-    pdf.p(f"작성일: {datetime.now().strftime('%Y-%m-%d')}")
-    pdf.h2("🧮 모델 함수식")
-    pdf.p(latex_equation_ml)
-    pdf.h2("🔮 예측값")
-    pdf.p(f"X={next_input:.2f} → 예측 Y = {pred_ml_next:.2f}")
-    if fig is not None:
-        pdf.h2("📈 시각화")
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmpfile:
-            fig.savefig(tmpfile.name, format="png", bbox_inches="tight", dpi=200)
-            pdf.image(tmpfile.name, x=10, w=pdf.w-20)
-    pdf.add_page()
-    pdf.h2("📝 데이터 분석 및 예측 결과 (학생 작성)")
-    pdf.p(analysis if analysis else "작성된 분석 없음")
-    return bytes(pdf.output(dest='S'))
+               x, y, y_pred, next_input, figure_args=None, cache=None):
+    return report.build_report({
+        "title": "인공지능 수열 예측 보고서",
+        "title_size": 20,
+        "band_height": 22,
+        "header_gap": 18,
+        "footer": report.footer_text(student_info),
+        "sections": [
+            report.student_info(student_info),
+            report.text("🧮 모델 함수식", latex_equation_ml),
+            report.text("🔮 예측값", f"X={next_input:.2f} → 예측 Y = {pred_ml_next:.2f}"),
+            report.figure_from("📈 시각화", ml_prediction_figure, *figure_args) if figure_args else report.figure(None, None),
+            report.page_break(),
+            report.text("📝 데이터 분석 및 예측 결과 (학생 작성)", analysis if analysis else "작성된 분석 없음"),
+        ],
+    }, cache=cache)
 
 def parse_sequence(seq_text: str):
     try:
@@ -131,25 +48,44 @@ def parse_sequence(seq_text: str):
     except Exception:
         return None, "숫자만 쉼표로 구분해 입력해 주세요."
 
-def fit_poly(x, y, degree):
-    poly = PolynomialFeatures(degree=degree, include_bias=False)
-    Xp = poly.fit_transform(x)
-    model = LinearRegression().fit(Xp, y)
-    y_hat = model.predict(Xp)
-    return model, poly, y_hat
-
-def run_deep_learning(x, y, hidden1, hidden2, epochs):
-    model = Sequential([
-        Dense(hidden1, input_shape=(x.shape[1],), activation='tanh'),
-        Dense(hidden2, activation='tanh'),
-        Dense(1)
+def _train_deep_learning(x, y, hidden1, hidden2, epochs, activation, seed, backend):
+    latex = f"Deep Learning (1-{hidden1}-{hidden2}-1)"
+    if backend == "numpy":
+        model = NumpyMLP(x.shape[1], hidden1, hidden2, activation=activation, seed=seed)
+        model.fit(x, y, epochs=epochs, batch_size=len(x), learning_rate=0.01)
+        return model, model.predict(x).flatten(), latex
+    init = keras.initializers.GlorotUniform
+    model = keras.models.Sequential([
+        keras.layers.Dense(hidden1, input_shape=(x.shape[1],), activation=activation, kernel_initializer=init(seed)),
+        keras.layers.Dense(hidden2, activation=activation, kernel_initializer=init(seed + 1)),
+        keras.layers.Dense(1, kernel_initializer=init(seed + 2))
     ])
-    model.compile(optimizer=Adam(0.01), loss='mse')
+    model.compile(optimizer=keras.optimizers.Adam(0.01), loss='mse')
     model.fit(x, y, epochs=epochs, verbose=0, batch_size=len(x))
-    y_pred = model.predict(x).flatten()
-    latex = f"Deep Learning (1-{hidden1}-{hidden2}-1)"
+    y_pred = model.predict(x, verbose=0).flatten()
     return model, y_pred, latex
 
+def run_deep_learning(x, y, hidden1, hidden2, epochs, activation='tanh', seed=0, backend=DL_BACKEND):
+    # 같은 데이터·설정이면 다른 학생이나 재실행에서도 학습된 모델을 재사용
+    key = model_key("data6", x, y, hidden1, hidden2, epochs, activation, seed, backend)
+    result = get_model(key)
+    if result is None:
+        result = _train_deep_learning(x, y, hidden1, hidden2, epochs, activation, seed, backend)
+        put_model(key, result)
+    return result
+
+def residual_chart_altair(x, y, y_hat, title, fit_label="추세선", residual_label="편차",
+                          show_data=True, show_fit=True, show_residuals=True):
+    order = np.argsort(x[:,0])
+    chart = AltairChart(title, "항 번호 (x)", "값 (y)")
+    if show_residuals:
+        chart.segments(x[:,0], y, y_hat, residual_label, "#FF5733", width=1)
+    if show_fit:
+        chart.line(x[order,0], y_hat[order], fit_label, "#FFC300", width=2)
+    if show_data:
+        chart.points(x[:,0], y, "실제값", "#1976D2", size=60)
+    return chart
+
 def plot_with_residual_lines(x, y, y_hat, title="데이터 & 추세선 및 편차", key_prefix="plot"):
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -158,16 +94,18 @@ def plot_with_residual_lines(x, y, y_hat, title="데이터 & 추세선 및 편
         show_fit = st.checkbox("추세선", value=True, key=f"{key_prefix}_fit")
     with col3:
         show_residuals = st.checkbox("편차", value=True, key=f"{key_prefix}_res")
-    fig, ax = plt.subplots()
+    if use_altair():
+        residual_chart_altair(x, y, y_hat, title, show_data=show_data, show_fit=show_fit,
+                              show_residuals=show_residuals).show()
+        return
+    fig, ax = new_figure()
     order = np.argsort(x[:,0])
-    colors = itertools.cycle(["#FF5733"])
     if show_data:
         ax.scatter(x[:,0], y, s=45, color="#1976D2", label="실제값", zorder=3)
     if show_fit:
         ax.plot(x[order,0], y_hat[order], linewidth=2, color="#FFC300", label="추세선", zorder=2)
     if show_residuals:
-        for xi, yi, ypi in zip(x[:,0], y, y_hat):
-            ax.plot([xi, xi], [yi, ypi], "--", color=next(colors), linewidth=1, label="편차" if xi==x[0,0] else "", zorder=1)
+        vertical_segments(ax, x[:,0], y, y_hat, color="#FF5733", linewidth=1, label="편차", zorder=1)
     ax.set_title(title, fontsize=13, fontweight="bold")
     ax.set_xlabel("항 번호 (x)")
     ax.set_ylabel("값 (y)")
@@ -175,7 +113,7 @@ def plot_with_residual_lines(x, y, y_hat, title="데이터 & 추세선 및 편
     handles, labels = ax.get_legend_handles_labels()
     by_label = dict(zip(labels, handles))
     ax.legend(by_label.values(), by_label.keys(), prop=fm.FontProperties(fname=font_path, size=10))
-    st.pyplot(fig)
+    show_figure(fig)
 
 def practice_widget(default_seq: str, tip: str = "", key_prefix: str = "d6"):
     st.divider()
@@ -212,8 +150,8 @@ def practice_widget(default_seq: str, tip: str = "", key_prefix: str = "d6"):
         st.warning(err)
         return None, None, None, None   
     x, y = parsed
-    model, poly, y_hat = fit_poly(x, y, degree)
-    latex_eq = poly_equation_to_latex(model, poly)
+    fit = fit_polynomial(x, y, degree)
+    y_hat, latex_eq = fit.y_pred, fit.latex
     col1, col2 = st.columns([3, 5])  
     with col1:
         st.markdown("""
@@ -236,6 +174,57 @@ def practice_widget(default_seq: str, tip: str = "", key_prefix: str = "d6"):
     plot_with_residual_lines(x, y, y_hat, title=f"다항 회귀 ({degree}차)와 편차 표시", key_prefix=key_prefix)
     return x, y, y_hat, degree   
 
+def ml_prediction_figure(x, y, y_pred_ml, latex_equation_ml, degree, x_next, pred_ml_next,
+                         show_data=True, show_fit=True, show_pred=True):
+    fig, ax = new_figure(figsize=(7, 5))
+    sorted_idx = np.argsort(x[:, 0])
+    x_sorted = x[sorted_idx, 0]
+    y_pred_ml_sorted = y_pred_ml[sorted_idx]
+    if show_data:
+        ax.scatter(x[:, 0], y, color='#1976d2', edgecolors='white', s=90, label='입력 데이터')
+    if show_fit:
+        ax.plot(x_sorted, y_pred_ml_sorted, color='#ff9800', linewidth=2.5, label=f'ML ({degree}차)')
+        ax.text(
+            0.38, 0.95,
+            f"$ {latex_equation_ml} $",
+            transform=ax.transAxes,
+            fontsize=12,
+            verticalalignment='top'
+        )
+    if show_pred:
+        ax.scatter(x_next[0][0], pred_ml_next, color='#d32f2f', edgecolors='black', s=130, marker='o', zorder=5, label='ML 예측')
+        ax.annotate(
+            f"예측: {pred_ml_next:.2f}",
+            (x_next[0][0], pred_ml_next),
+            textcoords="offset points",
+            xytext=(5, 20),
+            ha='left',
+            color='#d32f2f',
+            fontsize=12,
+            bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="#d32f2f", lw=1)
+        )
+    ax.set_title(f"머신러닝 예측 (차수={degree})", fontsize=15, fontweight='bold', color='#1976d2', pad=15)
+    ax.set_xlabel("항 번호 (x)")
+    ax.set_ylabel("값 (y)")
+    ax.grid(alpha=0.25)
+
+    ax.legend(fontsize=10, frameon=True, fancybox=True, shadow=True)
+    fig.tight_layout()
+    return fig
+
+def ml_prediction_altair(x, y, y_pred_ml, latex_equation_ml, degree, x_next, pred_ml_next,
+                         show_data=True, show_fit=True, show_pred=True):
+    sorted_idx = np.argsort(x[:, 0])
+    chart = AltairChart(f"머신러닝 예측 (차수={degree})", "항 번호 (x)", "값 (y)")
+    if show_fit:
+        chart.line(x[sorted_idx, 0], y_pred_ml[sorted_idx], f"ML ({degree}차): {latex_equation_ml}", "#ff9800", width=2.5)
+    if show_data:
+        chart.points(x[:, 0], y, "입력 데이터", "#1976d2")
+    if show_pred:
+        chart.points(x_next[0], [pred_ml_next], "ML 예측", "#d32f2f", size=130)
+        chart.text(x_next[0], [pred_ml_next], [f"예측: {pred_ml_next:.2f}"], color="#d32f2f", dx=8, dy=-20)
+    return chart
+
 # ✅ 메인 화면
 def show():
     st.header("🗓️ Day 6")
@@ -367,37 +356,13 @@ def show():
             with col1:
                 degree = st.slider("다항 회귀 차수 선택", 1, 4, 2, key="tab3_degree")
             with col2:
-                epochs = st.selectbox("학습 횟수 (Epochs)", [20, 40, 60], index=1, key="tab3_epochs")
-            poly = PolynomialFeatures(degree=degree, include_bias=False)
-            X_poly = poly.fit_transform(x)
-            model = LinearRegression().fit(X_poly, y)
-            progress = epochs / 60  
-            approx_coefs = model.coef_ * progress
-            approx_intercept = model.intercept_ * progress
-            y_hat = X_poly.dot(approx_coefs) + approx_intercept
-            full_eq = poly_equation_to_latex(model, poly)
-            eq_terms = []
-            terms = poly.get_feature_names_out(['x'])
-            term_list = []
-            for t, c in zip(terms, approx_coefs):
-                if abs(c) < 1e-8:
-                    continue
-                if t == "x":
-                    degree_val = 1
-                    term = (degree_val, f"{c:.2f}x")
-                elif "^" in t:
-                    degree_val = int(t.split("^")[1])
-                    term = (degree_val, f"{c:.2f}x^{{{degree_val}}}")
-                else:
-                    degree_val = 0
-                    term = (degree_val, f"{c:.2f}{t}")
-                term_list.append(term)
-            if abs(approx_intercept) > 1e-8:
-                term_list.append((0, f"{approx_intercept:.2f}"))
-            term_list.sort(key=lambda x: x[0], reverse=True)
-            eq_terms = [t[1] for t in term_list]
-            approx_eq = " + ".join(eq_terms).replace("+ -", "- ")
-            latex_eq = f"y = {approx_eq}"
+                epochs = st.slider("학습 횟수 (Epochs)", 0, GD_MAX_EPOCHS, 40, key="tab3_epochs")
+            # 수열·차수별로 한 번 계산해 둔 경사하강법 기록에서 현재 epoch의 상태를 꺼내 사용
+            trace = gd_trace(x[:, 0], y, degree, GD_MAX_EPOCHS)
+            approx_coefs = trace.coefs[epochs]
+            approx_intercept = trace.intercepts[epochs]
+            y_hat = trace.y_hats[epochs]
+            latex_eq = poly_latex(approx_coefs, approx_intercept)
             col1, col2 = st.columns([3, 5])
             with col1:
                 st.markdown("""
@@ -417,18 +382,20 @@ def show():
                 """, unsafe_allow_html=True)
             with col2:
                 st.latex(latex_eq)
-            fig, ax = plt.subplots()
-            ax.scatter(x, y, color="#1976D2", s=45, label="실제값")
-            ax.plot(x, y_hat, color="#FF9800", linewidth=2, label=f"추세선 (Epoch {epochs})")
-            for xi, yi, ypi in zip(x.flatten(), y, y_hat):
-                ax.plot([xi, xi], [yi, ypi], "--", color="red", linewidth=1, alpha=0.7,
-                        label="편차" if xi==x[0,0] else "")
-            ax.set_title(f"다항 회귀 (차수={degree}, Epoch={epochs})", fontsize=13, fontweight="bold")
-            ax.set_xlabel("항 번호 (x)")
-            ax.set_ylabel("값 (y)")
-            ax.legend()
-            st.pyplot(fig)
-            sse = np.sum((y - y_hat) ** 2)
+            if use_altair():
+                residual_chart_altair(x, y, y_hat, f"다항 회귀 (차수={degree}, Epoch={epochs})",
+                                      fit_label=f"추세선 (Epoch {epochs})").show()
+            else:
+                fig, ax = new_figure()
+                ax.scatter(x, y, color="#1976D2", s=45, label="실제값")
+                ax.plot(x, y_hat, color="#FF9800", linewidth=2, label=f"추세선 (Epoch {epochs})")
+                vertical_segments(ax, x, y, y_hat, color="red", linewidth=1, alpha=0.7, label="편차")
+                ax.set_title(f"다항 회귀 (차수={degree}, Epoch={epochs})", fontsize=13, fontweight="bold")
+                ax.set_xlabel("항 번호 (x)")
+                ax.set_ylabel("값 (y)")
+                ax.legend()
+                show_figure(fig)
+            sse = trace.sse[epochs]
             acc = r2_score(y, y_hat) * 100
             errors_df = pd.DataFrame({
                 "실제값": y,
@@ -510,22 +477,24 @@ def show():
             x_scaled = scaler.fit_transform(x)
             dl_model, y_pred_dl, latex_equation_dl = run_deep_learning(x_scaled, y, hidden1, hidden2, epochs)
             sse_dl = np.sum((y - y_pred_dl) ** 2)
-            mse_dl = mean_squared_error(y, y_pred_dl)
             acc_dl = r2_score(y, y_pred_dl) * 100
 
             st.info("👉 딥러닝은 충분한 학습(Epoch)과 적절한 은닉층 뉴런 수를 설정해야 성능이 향상됩니다!")
-            fig, ax = plt.subplots()
-            ax.scatter(x, y, color="#1976D2", s=45, label="실제값", zorder=3)
-            ax.plot(x, y_pred_dl, color="#FF9800", linewidth=2, label="딥러닝 예측값", zorder=2)
-            for xi, yi, ypi in zip(x.flatten(), y, y_pred_dl):
-                ax.plot([xi, xi], [yi, ypi], "--", color="red", linewidth=1, alpha=0.7, label="오차" if xi == x[0,0] else "")
-            ax.set_title("딥러닝 예측 vs 실제값", fontsize=13, fontweight="bold")
-            ax.set_xlabel("항 번호 (x)")
-            ax.set_ylabel("값 (y)")
-            ax.grid(alpha=0.25)
-            handles, labels = ax.get_legend_handles_labels()
-            ax.legend(dict(zip(labels, handles)).values(), dict(zip(labels, handles)).keys(), prop=fm.FontProperties(fname=font_path, size=10))
-            st.pyplot(fig)
+            if use_altair():
+                residual_chart_altair(x, y, y_pred_dl, "딥러닝 예측 vs 실제값",
+                                      fit_label="딥러닝 예측값", residual_label="오차").show()
+            else:
+                fig, ax = new_figure()
+                ax.scatter(x, y, color="#1976D2", s=45, label="실제값", zorder=3)
+                ax.plot(x, y_pred_dl, color="#FF9800", linewidth=2, label="딥러닝 예측값", zorder=2)
+                vertical_segments(ax, x, y, y_pred_dl, color="red", linewidth=1, alpha=0.7, label="오차")
+                ax.set_title("딥러닝 예측 vs 실제값", fontsize=13, fontweight="bold")
+                ax.set_xlabel("항 번호 (x)")
+                ax.set_ylabel("값 (y)")
+                ax.grid(alpha=0.25)
+                handles, labels = ax.get_legend_handles_labels()
+                ax.legend(dict(zip(labels, handles)).values(), dict(zip(labels, handles)).keys(), prop=fm.FontProperties(fname=font_path, size=10))
+                show_figure(fig)
             c1, c2 = st.columns(2)
             with c1:
                 st.metric("🔢 SSE (오차 합)", f"{sse_dl:.3f}")
@@ -580,11 +549,8 @@ def show():
         else:
             x, y = parsed
             degree = st.slider("다항 회귀 차수 선택", 1, 4, 2, key="ml_degree")
-            poly = PolynomialFeatures(degree=degree, include_bias=False)
-            X_poly = poly.fit_transform(x)
-            ml_model = LinearRegression().fit(X_poly, y)
-            y_pred_ml = ml_model.predict(X_poly)
-            latex_equation_ml = poly_equation_to_latex(ml_model, poly)
+            ml_fit = fit_polynomial(x, y, degree)
+            y_pred_ml, latex_equation_ml = ml_fit.y_pred, ml_fit.latex
             next_input = st.number_input(
                 "예측하고 싶은 X값 입력",
                 value=float(x[-1][0] + 1),
@@ -592,8 +558,7 @@ def show():
                 format="%.2f"
             )
             x_next = np.array([[next_input]])
-            X_next_trans = poly.transform(x_next)
-            pred_ml_next = ml_model.predict(X_next_trans)[0]
+            pred_ml_next = ml_fit.predict(x_next)[0]
 
             st.info(f"👉 X={next_input:.2f}일 때, 머신러닝 예측값은 **{pred_ml_next:.2f}** 입니다.")
             st.markdown("""
@@ -640,41 +605,12 @@ def show():
             with col1: show_data = st.checkbox("입력 데이터", value=True, key="show_data_ml")
             with col2: show_fit = st.checkbox("머신러닝 곡선", value=True, key="show_fit_ml")
             with col3: show_pred = st.checkbox("예측값", value=True, key="show_pred_ml")
-            fig, ax = plt.subplots(figsize=(7, 5))
-            sorted_idx = np.argsort(x[:, 0])
-            x_sorted = x[sorted_idx, 0]
-            y_pred_ml_sorted = y_pred_ml[sorted_idx]
-            if show_data:
-                ax.scatter(x[:, 0], y, color='#1976d2', edgecolors='white', s=90, label='입력 데이터')
-            if show_fit:
-                ax.plot(x_sorted, y_pred_ml_sorted, color='#ff9800', linewidth=2.5, label=f'ML ({degree}차)')
-                ax.text(
-                    0.38, 0.95,
-                    f"$ {latex_equation_ml} $",
-                    transform=ax.transAxes,
-                    fontsize=12,
-                    verticalalignment='top'
-                )
-            if show_pred:
-                ax.scatter(x_next[0][0], pred_ml_next, color='#d32f2f', edgecolors='black', s=130, marker='o', zorder=5, label='ML 예측')
-                ax.annotate(
-                    f"예측: {pred_ml_next:.2f}",
-                    (x_next[0][0], pred_ml_next),
-                    textcoords="offset points",
-                    xytext=(5, 20),
-                    ha='left',
-                    color='#d32f2f',
-                    fontsize=12,
-                    bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="#d32f2f", lw=1)
-                )
-            ax.set_title(f"머신러닝 예측 (차수={degree})", fontsize=15, fontweight='bold', color='#1976d2', pad=15)
-            ax.set_xlabel("항 번호 (x)")
-            ax.set_ylabel("값 (y)")
-            ax.grid(alpha=0.25)
-
-            ax.legend(fontsize=10, frameon=True, fancybox=True, shadow=True)
-            plt.tight_layout()
-            st.pyplot(fig)
+            figure_args = (x, y, y_pred_ml, latex_equation_ml, degree, x_next, pred_ml_next,
+                           show_data, show_fit, show_pred)
+            if use_altair():
+                ml_prediction_altair(*figure_args).show()
+            else:
+                show_figure(ml_prediction_figure(*figure_args))
             st.subheader("📝 데이터 분석 및 예측 결과 작성")
             col1, col2, col3 = st.columns([2, 1, 1])
             with col1:
@@ -690,19 +626,9 @@ def show():
             }
             analysis_text = st.text_area("데이터 분석 및 예측 결과를 작성하세요.", key="analysis_ml")
             if st.button("📥 PDF 저장하기"):
-                pdf_bytes = create_pdf(
-                    student_info,
-                    analysis_text,
-                    latex_equation_ml,
-                    pred_ml_next,
-                    x, y, y_pred_ml,
-                    next_input,
-                    fig=fig
-                )
-                st.download_button(
-                    label="📄 PDF 다운로드",
-                    data=pdf_bytes,
-                    file_name=f"AI_탐구보고서_{student_name}.pdf",
-                    mime="application/pdf"
-                )
+                pdf_args = (student_info, analysis_text, latex_equation_ml, pred_ml_next,
+                            x, y, y_pred_ml, next_input)
+                pdf_jobs.request(st.session_state, "pdf_job_d6", create_pdf, *pdf_args, figure_args,
+                                 report.session_cache(st.session_state, "report_cache_d6"))
+            pdf_jobs.show_download(st.session_state, "pdf_job_d6", "📄 PDF 다운로드", f"AI_탐구보고서_{student_name}.pdf")
         st.markdown("<hr style='border: 2px solid #2196F3;'>", unsafe_allow_html=True)
\ No newline at end of file
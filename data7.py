@@ -1,28 +1,31 @@
 import streamlit as st
 import numpy as np
-import matplotlib
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import PolynomialFeatures
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import Dense
-from tensorflow.keras.optimizers import Adam
-from sklearn.metrics import r2_score
-from sklearn.preprocessing import MinMaxScaler
-from fpdf import FPDF
+from lazy import lazy_import
+from charts import AltairChart, downsample, new_figure, show_figure, use_altair
+from fonts import FONT_PATH, register_korean_font
+from mlp import DL_BACKEND, NumpyMLP
+from model_cache import model_key, get_model, put_model
+import training
+from regression import MinMaxScaler, fit_polynomial, r2_score, select_degree
 from datetime import datetime
-import tempfile
-import io
 import pandas as pd
+import report
+import batch_export
+import pdf_jobs
+import dataprep
 import re
 import os
 
-font_path = os.path.join(os.path.dirname(__file__), "font/NanumGothic.ttf")
-fm.fontManager.addfont(font_path)
-font_name = fm.FontProperties(fname=font_path).get_name()
-matplotlib.rcParams['font.family'] = font_name
-matplotlib.rcParams['axes.unicode_minus'] = False
+# 무거운 의존성은 실제로 쓰일 때 불러옵니다.
+keras = lazy_import("tensorflow.keras")
+
+font_path = FONT_PATH
+register_korean_font()
+
+# 차수 자동 선택에서 비교할 최대 차수
+AUTO_MAX_DEGREE = 5
+# 파일 올리기에서 고를 수 있는 예시 데이터 (cp949 CSV: 연도, 평균기온)
+SAMPLE_DATA_PATH = os.path.join(os.path.dirname(__file__), "dataset", "dataset.csv")
 
 def pretty_title(text, color1, color2):
     return f"""
@@ -35,39 +38,6 @@ def pretty_title(text, color1, color2):
         <h4 style='margin-top:0;'><b>{text}</b></h4>
     </div>
     """
-def get_polynomial_equation_latex(model, poly):
-    terms = poly.get_feature_names_out(['x'])
-    coefs = model.coef_
-    intercept = model.intercept_
-    parsed_terms = []
-    for term, coef in zip(terms, coefs):
-        if abs(coef) > 1e-6:
-            if "^" in term:
-                degree = int(term.split("^")[1])
-            else:
-                degree = 1
-            parsed_terms.append((degree, coef))
-    parsed_terms.sort(reverse=True, key=lambda t: t[0])
-    latex_terms = []
-    for degree, coef in parsed_terms:
-        if abs(coef) == 1.0:
-            sign = "-" if coef < 0 else ""
-            term = f"{sign}x^{{{degree}}}"
-        else:
-            term = f"{coef:.2f}x^{{{degree}}}"
-        latex_terms.append(term)
-    if abs(intercept) > 1e-6:
-        sign = "-" if intercept < 0 else "+"
-        latex_terms.append(f"{sign}{abs(intercept):.2f}")
-    expr = " + ".join(latex_terms)
-    expr = re.sub(r"\+\s*\+", "+", expr)
-    expr = re.sub(r"\+\s*-\s*", "- ", expr)
-    expr = re.sub(r"-\s*-\s*", "+ ", expr)
-    expr = expr.strip()
-    if expr.startswith("+"):
-        expr = expr[1:]
-    return f"y = {expr}"
-
 def get_manual_equation_latex(coeffs, b):
     terms = []
     for deg, coef in coeffs:
@@ -89,175 +59,47 @@ def get_manual_equation_latex(coeffs, b):
     if expr.startswith("+"): expr = expr[1:]
     return f"y = {expr}" if terms else f"y = {b:.2f}"
 
-@st.cache_data
-def run_poly_regression(x, y, degree):
-    poly = PolynomialFeatures(degree=degree, include_bias=False)
-    X_train = poly.fit_transform(x)
-    model = LinearRegression().fit(X_train, y)
-    y_pred = model.predict(X_train)
-    latex = get_polynomial_equation_latex(model, poly)
-    return model, poly, y_pred, latex
-
-@st.cache_resource
-def run_deep_learning(x, y, hidden1, hidden2, epochs):
-    model = Sequential([
-        Dense(hidden1, input_shape=(x.shape[1],), activation='relu'), 
-        Dense(hidden2, activation='relu'),
-        Dense(1, activation='linear')  
+def _train_deep_learning(x, y, hidden1, hidden2, epochs, backend, on_epoch_end=None):
+    if backend == "numpy":
+        model = NumpyMLP(x.shape[1], hidden1, hidden2, activation='relu')
+        model.fit(x, y, epochs=epochs, batch_size=32, learning_rate=0.01, on_epoch_end=on_epoch_end)
+        return model, model.predict(x), f"Deep Learning (1-{hidden1}-{hidden2}-1)"
+    model = keras.models.Sequential([
+        keras.layers.Dense(hidden1, input_shape=(x.shape[1],), activation='relu'), 
+        keras.layers.Dense(hidden2, activation='relu'),
+        keras.layers.Dense(1, activation='linear')  
     ])
-    model.compile(optimizer=Adam(0.01), loss='mse')
-    model.fit(x, y, epochs=epochs, verbose=0, batch_size=32)  
+    model.compile(optimizer=keras.optimizers.Adam(0.01), loss='mse')
+    callbacks = [training.keras_progress_callback(on_epoch_end)] if on_epoch_end else []
+    model.fit(x, y, epochs=epochs, verbose=0, batch_size=32, callbacks=callbacks)
     y_pred = model.predict(x)
     return model, y_pred, f"Deep Learning (1-{hidden1}-{hidden2}-1)"
 
-class ThemedPDF(FPDF):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.alias_nb_pages()
-        self.set_auto_page_break(auto=True, margin=15)
-        self._font_family = "Nanum"
-        self.footer_left = ""
-        self.c_primary = (25, 118, 210)  
-        self.c_primary_lt = (227, 242, 253)  
-        self.c_accent = (67, 160, 71)     
-        self.c_warn = (211, 47, 47)       
-        self.c_border = (200, 200, 200)
-        self.c_text_muted = (120, 120, 120)
-
-    def header(self):
-        self.set_fill_color(*self.c_primary)
-        self.rect(0, 0, self.w, 22, 'F')
-        self.set_xy(10, 6)
-        self.set_text_color(255, 255, 255)
-        self.set_font(self._font_family, '', 25)
-        self.cell(0, 10, "데이터 기반 탐구 보고서", ln=1, align='C')
-        self.set_text_color(33, 33, 33)
-        self.ln(18)
-
-    def footer(self):
-        self.set_y(-15)
-        self.set_draw_color(*self.c_border)
-        self.set_line_width(0.2)
-        self.line(10, self.get_y(), self.w - 10, self.get_y())
-        self.set_y(-12)
-        self.set_font(self._font_family, '', 9)
-        self.set_text_color(*self.c_text_muted)
-        if self.footer_left:
-            self.cell(0, 8, self.footer_left, 0, 0, 'L')
-        self.cell(0, 8, f"{self.page_no()} / {{nb}}", 0, 0, 'R')
-
-    def h2(self, text):
-        self.set_fill_color(*self.c_primary_lt)
-        self.set_text_color(21, 101, 192)
-        self.set_font(self._font_family, '', 12)
-        self.cell(0, 9, text, ln=1, fill=True)
-        self.ln(2)
-        self.set_text_color(33, 33, 33)
-
-    def p(self, text, size=11, lh=6):
-        self.set_font(self._font_family, '', size)
-        self.multi_cell(0, lh, text)
-        self.ln(1)
-
-    def kv_card(self, title, kv_pairs):
-        """ key-value 형태의 카드 (2열) """
-        self.h2(title)
-        self.set_draw_color(*self.c_border)
-        self.set_line_width(0.3)
-        self.set_font(self._font_family, '', 11)
-        self.set_fill_color(255, 255, 255)
-        col_w = (self.w - 20) / 2  
-        cell_h = 8
-        x0 = 10
-        y0 = self.get_y()
-        for i, (k, v) in enumerate(kv_pairs):
-            x = x0 + (i % 2) * col_w
-            if i % 2 == 0 and i > 0:
-                self.ln(cell_h)
-            self.set_x(x)
-            # 키
-            self.set_text_color(120, 120, 120)
-            self.cell(col_w * 0.35, cell_h, str(k), border=1)
-            # 값
-            self.set_text_color(33, 33, 33)
-            self.cell(col_w * 0.65, cell_h, str(v), border=1)
-        if len(kv_pairs) % 2 == 1:
-            self.set_x(x0 + col_w)
-            self.set_text_color(120, 120, 120)
-            self.cell(col_w * 0.35, cell_h, "", border=1)
-            self.set_text_color(33, 33, 33)
-            self.cell(col_w * 0.65, cell_h, "", border=1)
-            self.ln(cell_h)
-        else:
-            self.ln(cell_h)
-        self.ln(2)
-
-    def info_card(self, title, lines):
-        self.h2(title)
-        self.set_draw_color(*self.c_border)
-        self.set_line_width(0.3)
-        self.set_font(self._font_family, '', 11)
-        self.set_fill_color(255, 255, 255)
-        x, y = 10, self.get_y()
-        w = self.w - 20
-        start_y = self.get_y()
-        for line in lines:
-            self.set_x(12)
-            self.multi_cell(w - 4, 7, line)
-        end_y = self.get_y()
-        self.rect(x, y, w, end_y - y)
-        self.ln(2)
-
-    def table(self, headers, rows, col_widths=None, zebra=True, highlight_row_idx=None):
-        """
-        headers: list[str]
-        rows: list[list]
-        col_widths: list[float] or None -> 자동 분배
-        """
-        self.set_font(self._font_family, '', 11)
-        border = 1
-        cell_h = 8
-        table_w = self.w - 20  
-        if col_widths is None:
-            col_widths = [table_w / len(headers)] * len(headers)
-        self.set_fill_color(240, 244, 248)
-        self.set_text_color(21, 101, 192)
-        for h, w in zip(headers, col_widths):
-            self.cell(w, cell_h, str(h), border=border, align='C', fill=True)
-        self.ln(cell_h)
-        self.set_text_color(33, 33, 33)
-        for i, row in enumerate(rows):
-            if zebra and i % 2 == 1:
-                self.set_fill_color(250, 250, 250)
-                fill = True
-            else:
-                self.set_fill_color(255, 255, 255)
-                fill = True
-            if highlight_row_idx is not None and i == highlight_row_idx:
-                self.set_fill_color(255, 249, 196) 
-                fill = True
-            for val, w in zip(row, col_widths):
-                self.cell(w, cell_h, str(val), border=border, align='C', fill=fill)
-            self.ln(cell_h)
-        self.ln(2)
+def run_deep_learning(x, y, hidden1, hidden2, epochs, backend=DL_BACKEND):
+    # 배열 내용으로 키를 만들어 공유 저장소(LRU + TTL)에 보관
+    key = model_key("data7", x, y, hidden1, hidden2, epochs, backend)
+    result = get_model(key)
+    if result is not None:
+        training.cancel_stale(st.session_state, "d7_dl_job", key)
+        return result
+    # 학습은 백그라운드 스레드에서 진행하고, 끝날 때까지 손실 곡선을 실시간으로 표시
+    # (슬라이더를 다시 움직이면 이 대기는 중단되고 다음 실행에서 이전 학습이 취소됨)
+    job = training.session_job(
+        st.session_state, "d7_dl_job", key, _train_deep_learning,
+        x, y, hidden1, hidden2, epochs, backend,
+        on_result=lambda result: put_model(key, result)
+    )
+    progress = st.empty()
+    while not job.wait(0.3):
+        with progress.container():
+            st.caption(f"⏳ 딥러닝 모델 학습 중... ({len(job.losses)}/{epochs} epoch)")
+            st.line_chart(job.losses, height=180, x_label="epoch", y_label="loss")
+    progress.empty()
+    return job.result()
 
 def create_pdf(student_info, analysis, interpretation, comparison_df, errors_df, 
                latex_equation_ml, latex_equation_dl, pred_ml_next, pred_dl_next, 
-               x_name, y_name, next_input, fig=None):
-    pdf = ThemedPDF()
-    pdf.add_font('Nanum', '', font_path, uni=True)
-    pdf.set_font('Nanum', '', 12)
-    pdf._font_family = "Nanum"   
-    pdf.footer_left = f"{student_info.get('school','')} • {student_info.get('name','')}"
-    pdf.add_page()
-    pdf.add_font('Nanum', '', font_path, uni=True)
-    pdf.set_font('Nanum', '', 12)
-    pdf.footer_left = f"{student_info.get('school','')} • {student_info.get('name','')}"
-    pdf.set_title("데이터 기반 탐구 보고서")
-    pdf.set_author(student_info.get('name', ''))
-    pdf.set_subject(student_info.get('topic', ''))
-    pdf.set_creator("AI Sequence Predictor")
-    pdf.set_keywords("AI, Machine Learning, Deep Learning, Regression")
+               x_name, y_name, next_input, figure_args=None, cache=None):
     kvs = [
         ("학교", student_info.get('school', '')),
         ("학번", student_info.get('id', '')),
@@ -265,37 +107,221 @@ def create_pdf(student_info, analysis, interpretation, comparison_df, errors_df,
         ("탐구 주제", student_info.get('topic', '')),
         ("작성일", datetime.now().strftime("%Y-%m-%d")),
     ]
-    pdf.ln(5)  
-    pdf.kv_card("👤 학생 정보", kvs)
-    pdf.info_card("🧮 모델 함수식",
-        [f"머신러닝: {latex_equation_ml}",
-         f"딥러닝: {latex_equation_dl}"]
-    )
-    pdf.info_card("🔮 예측 요약",
-        [f"{x_name} = {next_input:.2f} 일 때",
-         f"• 머신러닝 예측 {y_name}: {pred_ml_next:.2f}",
-         f"• 딥러닝 예측 {y_name}: {pred_dl_next:.2f}"]
-    )
-    headers = ["모델", "SSE", "정확도"]
     rows = comparison_df[["모델", "SSE", "정확도"]].values.tolist()
     min_sse_idx = comparison_df["SSE"].astype(float).idxmin()
     highlight_idx = list(comparison_df.index).index(min_sse_idx)
-    pdf.h2("📊 모델 비교")
-    pdf.table(headers, rows, highlight_row_idx=highlight_idx)
-    if fig is not None:
-        pdf.add_page()  
-        pdf.h2("📈 시각화")
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmpfile:
-            fig.savefig(tmpfile.name, format="png", bbox_inches="tight", dpi=200)
-            pdf.image(tmpfile.name, x=10, y=None, w=pdf.w-20)
-        pdf.ln(3)
-    pdf.h2("📝 데이터 분석 및 예측 결과 (학생 작성)")
-    pdf.p(analysis if analysis else "내용 없음")
-    pdf.h2("📖 탐구 결과 및 해석 (학생 작성)")
-    pdf.p(interpretation if interpretation else "내용 없음")
-    return bytes(pdf.output(dest='S'))
+    sections = [
+        report.spacer(5),
+        report.key_values("👤 학생 정보", kvs),
+        report.card("🧮 모델 함수식",
+            [f"머신러닝: {latex_equation_ml}",
+             f"딥러닝: {latex_equation_dl}"]
+        ),
+        report.card("🔮 예측 요약",
+            [f"{x_name} = {next_input:.2f} 일 때",
+             f"• 머신러닝 예측 {y_name}: {pred_ml_next:.2f}",
+             f"• 딥러닝 예측 {y_name}: {pred_dl_next:.2f}"]
+        ),
+        report.table("📊 모델 비교", ["모델", "SSE", "정확도"], rows, highlight_row=highlight_idx),
+    ]
+    if figure_args:
+        sections += [report.page_break(), report.figure_from("📈 시각화", comparison_figure, *figure_args)]
+    sections += [
+        report.text("📝 데이터 분석 및 예측 결과 (학생 작성)", analysis if analysis else "내용 없음"),
+        report.text("📖 탐구 결과 및 해석 (학생 작성)", interpretation if interpretation else "내용 없음"),
+    ]
+    return report.build_report({
+        "title": "데이터 기반 탐구 보고서",
+        "title_size": 25,
+        "band_height": 22,
+        "header_gap": 18,
+        "footer": report.footer_text(student_info),
+        "metadata": {
+            "title": "데이터 기반 탐구 보고서",
+            "author": student_info.get('name', ''),
+            "subject": student_info.get('topic', ''),
+            "creator": "AI Sequence Predictor",
+            "keywords": "AI, Machine Learning, Deep Learning, Regression",
+        },
+        "sections": sections,
+    }, cache=cache)
+
+def pdf_from_submission(submission):
+    """저장해 둔 제출 파일(JSON)로 보고서를 다시 만듦 (batch_export에서 사용)"""
+    figure_args = None
+    chart = submission.get("chart")
+    if chart:
+        figure_args = (
+            np.asarray(chart["x"], dtype=float).reshape(-1, 1), np.asarray(chart["y"], dtype=float),
+            np.asarray(chart["y_pred_ml"], dtype=float), np.asarray(chart["y_pred_dl"], dtype=float),
+            np.array([[submission["next_input"]]]), submission["pred_ml_next"], submission["pred_dl_next"],
+            submission["latex_equation_ml"], submission["latex_equation_dl"],
+            submission["x_name"], submission["y_name"]
+        )
+    pdf_args = (
+        submission.get("student_info", {}),
+        submission.get("analysis", ""),
+        submission.get("interpretation", ""),
+        pd.DataFrame(submission["comparison"]),
+        None,
+        submission["latex_equation_ml"],
+        submission["latex_equation_dl"],
+        submission["pred_ml_next"],
+        submission["pred_dl_next"],
+        submission["x_name"],
+        submission["y_name"],
+        submission["next_input"],
+    )
+    return create_pdf(*pdf_args, figure_args=figure_args)
+
+def comparison_figure(x, y, y_pred_ml, y_pred_dl, x_next, pred_ml_next, pred_dl_next,
+                      latex_equation_ml, latex_equation_dl, x_name, y_name,
+                      show_data=True, show_ml=True, show_dl=True, show_pred=True):
+    fig, ax = new_figure(figsize=(7, 5))
+    if show_data:
+        ax.scatter(
+            x[:, 0], y,
+            color='#1976d2', edgecolors='white', linewidths=1.8,
+            s=90, marker='o', label='입력 데이터'
+        )
+    sorted_idx = np.argsort(x[:, 0])
+    x_sorted = x[sorted_idx, 0]
+    if show_ml:
+        y_pred_ml_sorted = y_pred_ml[sorted_idx]
+        ax.plot(
+            x_sorted, y_pred_ml_sorted,
+            color='#ff9800', linestyle='--', linewidth=2.5, label='머신러닝'
+        )
+        ax.text(
+            0.38, 0.95,
+            f"ML: $ {latex_equation_ml} $",
+            transform=ax.transAxes,
+            fontsize=12,
+            verticalalignment='top'
+        )
+    if show_dl:
+        y_pred_dl_sorted = y_pred_dl[sorted_idx]
+        ax.plot(
+            x_sorted, y_pred_dl_sorted,
+            color='#43a047', linestyle='-', linewidth=2.5, label='딥러닝'
+        )
+        ax.text(
+            0.38, 0.88,
+            f"DL: $ {latex_equation_dl} $",
+            transform=ax.transAxes,
+            fontsize=12,
+            verticalalignment='top'
+        )
+    if show_pred:
+        ax.scatter(
+            x_next[0][0], pred_ml_next,
+            color='#d32f2f', edgecolors='black', s=130, marker='o', zorder=5, label='ML 예측'
+        )
+        ax.annotate(
+            f"ML 예측: {pred_ml_next:.2f}",
+            (x_next[0][0], pred_ml_next),
+            textcoords="offset points",
+            xytext=(5, -30),
+            ha='left',
+            color='#d32f2f',
+            fontsize=12,
+            bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="#d32f2f", lw=1)
+        )
+        ax.scatter(
+            x_next[0][0], pred_dl_next,
+            color='#f06292', edgecolors='black', s=130, marker='X', zorder=5, label='DL 예측'
+        )
+        ax.annotate(
+            f"DL 예측: {pred_dl_next:.2f}",
+            (x_next[0][0], pred_dl_next),
+            textcoords="offset points",
+            xytext=(5, 20),
+            ha='left',
+            color='#f06292',
+            fontsize=12,
+            bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="#f06292", lw=1)
+        )
+    ax.set_title(
+        f"{x_name}와(과) {y_name}의 관계 및 예측\n",
+        fontsize=15, fontweight='bold', color='#1976d2', pad=15
+    )
+    ax.set_xlabel(x_name, fontsize=13, fontweight='bold')
+    ax.set_ylabel(y_name, fontsize=13, fontweight='bold')
+    ax.grid(alpha=0.25)
+    handles, labels = ax.get_legend_handles_labels()
+    if labels:
+        leg = ax.legend(
+            fontsize=8, loc='upper left', frameon=True, fancybox=True, framealpha=0.88, shadow=True,
+            borderpad=1, labelspacing=0.8
+        )
+        for line in leg.get_lines():
+            line.set_linewidth(3.0)
+    fig.tight_layout()
+    return fig
+
+def comparison_altair(x, y, y_pred_ml, y_pred_dl, x_next, pred_ml_next, pred_dl_next,
+                      latex_equation_ml, latex_equation_dl, x_name, y_name,
+                      show_data=True, show_ml=True, show_dl=True, show_pred=True):
+    sorted_idx = np.argsort(x[:, 0])
+    chart = AltairChart(f"{x_name}와(과) {y_name}의 관계 및 예측", x_name, y_name)
+    if show_data:
+        chart.points(x[:, 0], y, "입력 데이터", "#1976d2")
+    if show_ml:
+        chart.line(x[sorted_idx, 0], y_pred_ml[sorted_idx], f"머신러닝: {latex_equation_ml}", "#ff9800", dash=(6, 4), width=2.5)
+    if show_dl:
+        chart.line(x[sorted_idx, 0], y_pred_dl[sorted_idx], f"딥러닝: {latex_equation_dl}", "#43a047", width=2.5)
+    if show_pred:
+        chart.points(x_next[0], [pred_ml_next], "ML 예측", "#d32f2f", size=130)
+        chart.text(x_next[0], [pred_ml_next], [f"ML 예측: {pred_ml_next:.2f}"], color="#d32f2f", dx=8, dy=24)
+        chart.points(x_next[0], [pred_dl_next], "DL 예측", "#f06292", size=130, shape="cross")
+        chart.text(x_next[0], [pred_dl_next], [f"DL 예측: {pred_dl_next:.2f}"], color="#f06292", dx=8, dy=-20)
+    return chart
+
+def page_of(df, key):
+    """큰 표를 PREVIEW_ROWS행씩 나눈 쪽 가운데 학생이 고른 한 쪽만 반환"""
+    pages = max(1, -(-len(df) // dataprep.PREVIEW_ROWS))
+    page = st.number_input(f"쪽 번호 (전체 {pages:,}쪽, {len(df):,}행)", min_value=1, max_value=pages,
+                           value=1, step=1, key=key)
+    start = (page - 1) * dataprep.PREVIEW_ROWS
+    return df.iloc[start:start + dataprep.PREVIEW_ROWS]
 
 # ✅ 메인 화면
+def uploaded_data():
+    """CSV·엑셀 파일을 올리고 X/Y 열을 골라 (x, y, x_name, y_name)을 반환 (준비가 안 되면 화면을 멈춤)"""
+    uploaded = st.file_uploader("CSV 또는 엑셀(xlsx) 파일을 올리세요. 첫 줄은 열 이름이어야 합니다.",
+                                type=["csv", "xlsx"], key="data_file")
+    if uploaded is not None:
+        data, filename = uploaded.getvalue(), uploaded.name
+    elif st.checkbox("예시 데이터(연도별 평균기온) 사용하기", key="use_sample_data"):
+        with open(SAMPLE_DATA_PATH, "rb") as f:
+            data, filename = f.read(), os.path.basename(SAMPLE_DATA_PATH)
+    else:
+        st.info("📂 파일을 올리거나 예시 데이터를 선택하세요.")
+        st.stop()
+    try:
+        table = dataprep.read_table(data, filename)
+    except dataprep.DataError as e:
+        st.error(f"❌ {e}")
+        st.stop()
+    columns = dataprep.numeric_columns(table)
+    if len(columns) < 2:
+        st.error("❌ 숫자로 된 열이 두 개 이상 있어야 합니다.")
+        st.stop()
+    st.caption(f"📄 {filename}: {len(table):,}행 × {len(table.columns)}열")
+    col_x, col_y = st.columns(2)
+    with col_x:
+        x_col = st.selectbox("X 열", columns, index=0, key="x_col")
+    with col_y:
+        y_options = [col for col in columns if col != x_col]
+        y_col = st.selectbox("Y 열", y_options, index=0, key="y_col")
+    x, y, dropped = dataprep.xy_arrays(table, x_col, y_col)
+    if dropped:
+        st.warning(f"⚠️ 비어 있거나 숫자가 아닌 {dropped:,}개 행은 제외했습니다.")
+    if len(y) < 2:
+        st.error("❌ 두 열 모두 숫자인 행이 두 개 이상 있어야 합니다.")
+        st.stop()
+    return x, y, str(x_col), str(y_col)
+
 def show():
     st.header("🗓️ Day 7")
     st.subheader("AI 예측 스튜디오")
@@ -421,14 +447,16 @@ def show():
             x_name, y_name = "X", "Y"
         else:
             st.markdown(f"#### 🎓 실생활 데이터 입력")
-            if st.button("🔄 초기화", type="primary"):
-                st.session_state["x_input"] = ""
-                st.session_state["y_input"] = ""
-            with st.expander("🔤 변수 설명(이름) 입력"):
-                x_name_input = st.text_input("X 변수의 이름/설명 (예: 공부 시간, 키 등)", value="연도")
-                y_name_input = st.text_input("Y 변수의 이름/설명 (예: 점수, 몸무게 등)", value="평균기온(℃)")
-            x_name = x_name_input.strip() if x_name_input.strip() else "X"
-            y_name = y_name_input.strip() if y_name_input.strip() else "Y"
+            data_source = st.radio("데이터 입력 방법", ["직접 입력", "파일 올리기 (CSV·엑셀)"], horizontal=True, key="data_source")
+            if data_source == "직접 입력":
+                if st.button("🔄 초기화", type="primary"):
+                    st.session_state["x_input"] = ""
+                    st.session_state["y_input"] = ""
+                with st.expander("🔤 변수 설명(이름) 입력"):
+                    x_name_input = st.text_input("X 변수의 이름/설명 (예: 공부 시간, 키 등)", value="연도")
+                    y_name_input = st.text_input("Y 변수의 이름/설명 (예: 점수, 몸무게 등)", value="평균기온(℃)")
+                x_name = x_name_input.strip() if x_name_input.strip() else "X"
+                y_name = y_name_input.strip() if y_name_input.strip() else "Y"
         if input_mode == "수열 입력":
             default_seq = "2, 5, 8, 11, 14, 17"
             st.markdown(f"#### 🎓 수열 데이터 입력")
@@ -439,26 +467,29 @@ def show():
             y = np.array(list(map(float, seq_input.split(","))))
             x = np.arange(1, len(y) + 1).reshape(-1, 1)
         else:
-            x_input = st.text_input(f"{x_name} 값 (쉼표로 구분):",
-                                    "2000,2001,2002,2003,2004,2005,2006,2007,2008,2009,2010,2011,2012,2013,2014,2015,2016,2017,2018,2019,2020,2021,2022,2023,2024",
-                                    key="x_input")
-            y_input = st.text_input(f"{y_name} 값 (쉼표로 구분):",
-                                    "12.2,12.4,12.4,12.2,12.9,12.1,12.6,13.0,12.7,12.7,12.4,12.1,12.1,12.6,12.8,13.1,13.4,12.8,12.8,13.3,13.0,13.3,12.9,13.7,14.5",
-                                    key="y_input")
-            if not x_input.strip() or not y_input.strip():
-                st.warning("⚠️ 데이터를 입력해주세요. (X, Y 값이 모두 필요합니다)")
-                st.stop()
-            try:
-                x_vals = list(map(float, x_input.strip().split(",")))
-                y = list(map(float, y_input.strip().split(",")))
-            except ValueError:
-                st.error("❌ 숫자만 쉼표로 구분해 입력해 주세요!")
-                st.stop()
-            if len(x_vals) != len(y):
-                st.error(f"❌ {x_name}와 {y_name}의 길이가 같아야 합니다.")
-                st.stop()
-            x = np.array(x_vals).reshape(-1, 1)
-            y = np.array(y)
+            if data_source == "직접 입력":
+                x_input = st.text_input(f"{x_name} 값 (쉼표로 구분):",
+                                        "2000,2001,2002,2003,2004,2005,2006,2007,2008,2009,2010,2011,2012,2013,2014,2015,2016,2017,2018,2019,2020,2021,2022,2023,2024",
+                                        key="x_input")
+                y_input = st.text_input(f"{y_name} 값 (쉼표로 구분):",
+                                        "12.2,12.4,12.4,12.2,12.9,12.1,12.6,13.0,12.7,12.7,12.4,12.1,12.1,12.6,12.8,13.1,13.4,12.8,12.8,13.3,13.0,13.3,12.9,13.7,14.5",
+                                        key="y_input")
+                if not x_input.strip() or not y_input.strip():
+                    st.warning("⚠️ 데이터를 입력해주세요. (X, Y 값이 모두 필요합니다)")
+                    st.stop()
+                try:
+                    x_vals = list(map(float, x_input.strip().split(",")))
+                    y = list(map(float, y_input.strip().split(",")))
+                except ValueError:
+                    st.error("❌ 숫자만 쉼표로 구분해 입력해 주세요!")
+                    st.stop()
+                if len(x_vals) != len(y):
+                    st.error(f"❌ {x_name}와 {y_name}의 길이가 같아야 합니다.")
+                    st.stop()
+                x = np.array(x_vals).reshape(-1, 1)
+                y = np.array(y)
+            else:
+                x, y, x_name, y_name = uploaded_data()
             st.markdown("### ⚙️ 이상치 전처리 옵션")
             outlier_methods = st.multiselect(
                 "이상치 처리 방법을 선택하세요 (여러 개 가능):",
@@ -469,48 +500,41 @@ def show():
                 st.info("📊 **IQR(Interquartile Range) 방식**\n\n"
                         "- Q1(25%), Q3(75%)를 기준으로 IQR = Q3 - Q1 계산\n"
                         "- [Q1 - 1.5×IQR, Q3 + 1.5×IQR] 범위 밖은 이상치")
-                Q1_x, Q3_x = np.percentile(x.flatten(), [25, 75])
-                Q1_y, Q3_y = np.percentile(y.flatten(), [25, 75])
-                IQR_x, IQR_y = Q3_x - Q1_x, Q3_y - Q1_y
-                mask = (
-                    (x.flatten() >= Q1_x - 1.5 * IQR_x) & (x.flatten() <= Q3_x + 1.5 * IQR_x) &
-                    (y.flatten() >= Q1_y - 1.5 * IQR_y) & (y.flatten() <= Q3_y + 1.5 * IQR_y)
-                )
-                x, y = x[mask], y[mask]
-                st.success(f"✅ IQR 방식 적용: {len(x)}개 데이터 남음")
             if "Z-Score 방식" in outlier_methods:
                 st.info("📈 **Z-Score 방식**\n\n"
                         "- 평균에서 몇 표준편차 떨어져 있는지 계산\n"
                         "- |Z| > 3 인 데이터는 이상치로 제거")
-                from scipy import stats
-                z_scores = np.abs(stats.zscore(np.column_stack((x.flatten(), y.flatten()))))
-                mask = (z_scores < 3).all(axis=1)
-                x, y = x[mask], y[mask]
-                st.success(f"✅ Z-Score 방식 적용: {len(x)}개 데이터 남음")
+            x, y, removed = dataprep.remove_outliers(x, y, outlier_methods)
+            for method, count in removed:
+                st.success(f"✅ {method} 적용: {count:,}개 제거")
+            if removed:
+                st.success(f"✅ 이상치 처리 후 {len(y):,}개 데이터 남음")
 
             if outlier_methods == ["없음"]:
                 st.info("🔍 이상치 전처리를 적용하지 않았습니다.")
         st.divider()
+        # 행이 많으면 표를 쪽 단위로 보여 주고 그래프의 점을 줄임 (모델 학습은 항상 전체 데이터로)
+        large = dataprep.is_large(len(y))
         st.markdown(f"##### 📝 입력 데이터 미리보기 ({x_name}, {y_name})")
         data_df = pd.DataFrame({
             x_name: x.flatten(),
             y_name: y.flatten()
         })
-        st.dataframe(data_df.T, use_container_width=True)
+        if large:
+            st.info(f"📦 데이터가 {len(data_df):,}행이라 큰 데이터 모드로 보여 줍니다. (모델은 전체 데이터로 학습)")
+            st.dataframe(page_of(data_df, "data_page"), use_container_width=True)
+        else:
+            st.dataframe(data_df.T, use_container_width=True)
         if input_mode == "수열 입력":
             st.info("**참고:** 수열의 X값(즉, 항의 번호)은 항상 1, 2, 3, ...과 같은 자연수입니다.")
         st.markdown(f"##### 📑 데이터 요약 정보 ({x_name}, {y_name})")
-        x_mean, y_mean = data_df[x_name].mean(), data_df[y_name].mean()
-        x_std, y_std = data_df[x_name].std(), data_df[y_name].std()
-        x_min, y_min = data_df[x_name].min(), data_df[y_name].min()
-        x_max, y_max = data_df[x_name].max(), data_df[y_name].max()
-        correlation = data_df[x_name].corr(data_df[y_name])
+        stats = dataprep.summary_stats(x, y)
         summary_df = pd.DataFrame({
-            "평균": [round(x_mean, 2), round(y_mean, 2)],
-            "표준편차": [round(x_std, 2), round(y_std, 2)],
-            "최솟값": [round(x_min, 2), round(y_min, 2)],
-            "최댓값": [round(x_max, 2), round(y_max, 2)],
-            "상관계수": [None, round(correlation, 2)]
+            "평균": stats["mean"].round(2),
+            "표준편차": stats["std"].round(2),
+            "최솟값": stats["min"].round(2),
+            "최댓값": stats["max"].round(2),
+            "상관계수": [None, round(stats["corr"], 2)]
         }, index=[x_name, y_name])
         summary_df.index.name = "항목"
         styled_df = summary_df.style.set_properties(**{
@@ -529,11 +553,22 @@ def show():
         with ml_col:
             st.markdown(pretty_title("🤖 머신러닝 (다항 회귀)", "#e3f2fd", "#bbdefb"), unsafe_allow_html=True)
             st.info("👉 머신러닝 모델은 데이터를 보고 자동으로 다항 회귀식을 학습합니다.")
-            degree = st.selectbox("차수 선택", options=[1, 2, 3], index=0)
-            ml_model, ml_poly, y_pred_ml, latex_equation_ml = run_poly_regression(x, y, degree)
-            sse_ml = np.sum((y - y_pred_ml) ** 2)
+            selection = None
+            degree = st.selectbox(
+                "차수 선택", options=["auto", 1, 2, 3], index=1,
+                format_func=lambda d: "자동 (교차검증)" if d == "auto" else str(d)
+            )
+            if degree == "auto":
+                selection = select_degree(x, y, AUTO_MAX_DEGREE)
+                degree = selection.best_degree
+            ml_fit = fit_polynomial(x, y, degree)
+            y_pred_ml, latex_equation_ml, sse_ml = ml_fit.y_pred, ml_fit.latex, ml_fit.sse
             st.markdown("#### **📐 머신러닝 함수식**")
             st.latex(latex_equation_ml)
+            if selection is not None:
+                st.success(f"👉 한 점씩 빼고 예측해 본 오차(LOOCV)가 가장 작은 **{degree}차**를 선택했습니다.")
+                cv_df = pd.DataFrame({"차수": selection.degrees, "LOOCV 오차": selection.cv_mse}).set_index("차수")
+                st.line_chart(cv_df, height=180, x_label="차수", y_label="LOOCV 오차")
         with dl_col:
             st.markdown(pretty_title("🧠 딥러닝 (신경망)", "#e3f2fd", "#bbdefb"), unsafe_allow_html=True)
             st.info("👉 딥러닝 모델은 인공 신경망으로 복잡한 패턴까지 학습할 수 있습니다.")
@@ -553,7 +588,7 @@ def show():
             st.latex(latex_equation_dl)
         st.divider()
         st.markdown(pretty_title("📋 모델 비교", "#e3f2fd", "#bbdefb"), unsafe_allow_html=True)
-        acc_ml = r2_score(y, y_pred_ml) * 100
+        acc_ml = ml_fit.r2 * 100
         acc_dl = r2_score(y, y_pred_dl) * 100
         comparison_df = pd.DataFrame({
                 "모델": ["머신러닝", "딥러닝"],
@@ -571,8 +606,9 @@ def show():
         errors_df["머신러닝 오차"] = (errors_df["실제값"] - errors_df["머신러닝 예측값"]).abs()
         errors_df["딥러닝 오차"] = (errors_df["실제값"] - errors_df["딥러닝 예측값"]).abs()
         st.markdown("##### 📉 실제값과 예측값 오차 비교")
+        errors_view = page_of(errors_df, "errors_page") if large else errors_df
         st.dataframe(
-            errors_df.style.format(precision=2).background_gradient(
+            errors_view.style.format(precision=2).background_gradient(
                 cmap='Reds', subset=["머신러닝 오차", "딥러닝 오차"]
             ),
             use_container_width=True, height=250, hide_index=True
@@ -599,8 +635,7 @@ def show():
                 format="%.2f"
             )
             x_next = np.array([[next_input]])
-            X_next_trans = ml_poly.transform(x_next)
-            pred_ml_next = ml_model.predict(X_next_trans)[0]
+            pred_ml_next = ml_fit.predict(x_next)[0]
             x_next_scaled = scaler_x.transform(x_next)
             pred_dl_next_scaled = dl_model.predict(x_next_scaled)
             pred_dl_next = scaler_y.inverse_transform(pred_dl_next_scaled)[0][0]
@@ -658,87 +693,19 @@ def show():
         with col2: show_ml = st.checkbox("머신러닝", value=True, key="show_ml")
         with col3: show_dl = st.checkbox("딥러닝", value=True, key="show_dl")
         with col4: show_pred = st.checkbox("예측", value=True, key="show_pred")
-        fig, ax = plt.subplots(figsize=(7, 5))
-        if show_data:
-            ax.scatter(
-                x[:, 0], y,
-                color='#1976d2', edgecolors='white', linewidths=1.8,
-                s=90, marker='o', label='입력 데이터'
-            )
-        sorted_idx = np.argsort(x[:, 0])
-        x_sorted = x[sorted_idx, 0]
-        if show_ml:
-            y_pred_ml_sorted = y_pred_ml[sorted_idx]
-            ax.plot(
-                x_sorted, y_pred_ml_sorted,
-                color='#ff9800', linestyle='--', linewidth=2.5, label='머신러닝'
-            )
-            ax.text(
-                0.38, 0.95,
-                f"ML: $ {latex_equation_ml} $",
-                transform=ax.transAxes,
-                fontsize=12,
-                verticalalignment='top'
-            )
-        if show_dl:
-            y_pred_dl_sorted = y_pred_dl[sorted_idx]
-            ax.plot(
-                x_sorted, y_pred_dl_sorted,
-                color='#43a047', linestyle='-', linewidth=2.5, label='딥러닝'
-            )
-            ax.text(
-                0.38, 0.88,
-                f"DL: $ {latex_equation_dl} $",
-                transform=ax.transAxes,
-                fontsize=12,
-                verticalalignment='top'
-            )
-        if show_pred:
-            ax.scatter(
-                x_next[0][0], pred_ml_next,
-                color='#d32f2f', edgecolors='black', s=130, marker='o', zorder=5, label='ML 예측'
-            )
-            ax.annotate(
-                f"ML 예측: {pred_ml_next:.2f}",
-                (x_next[0][0], pred_ml_next),
-                textcoords="offset points",
-                xytext=(5, -30),
-                ha='left',
-                color='#d32f2f',
-                fontsize=12,
-                bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="#d32f2f", lw=1)
-            )
-            ax.scatter(
-                x_next[0][0], pred_dl_next,
-                color='#f06292', edgecolors='black', s=130, marker='X', zorder=5, label='DL 예측'
-            )
-            ax.annotate(
-                f"DL 예측: {pred_dl_next:.2f}",
-                (x_next[0][0], pred_dl_next),
-                textcoords="offset points",
-                xytext=(5, 20),
-                ha='left',
-                color='#f06292',
-                fontsize=12,
-                bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="#f06292", lw=1)
-            )
-        ax.set_title(
-            f"{x_name}와(과) {y_name}의 관계 및 예측\n",
-            fontsize=15, fontweight='bold', color='#1976d2', pad=15
-        )
-        ax.set_xlabel(x_name, fontsize=13, fontweight='bold')
-        ax.set_ylabel(y_name, fontsize=13, fontweight='bold')
-        ax.grid(alpha=0.25)
-        handles, labels = ax.get_legend_handles_labels()
-        if labels:
-            leg = ax.legend(
-                fontsize=8, loc='upper left', frameon=True, fancybox=True, framealpha=0.88, shadow=True,
-                borderpad=1, labelspacing=0.8
-            )
-            for line in leg.get_lines():
-                line.set_linewidth(3.0)
-        plt.tight_layout()
-        st.pyplot(fig)
+        keep = downsample(x[:, 0], y)
+        if keep is None:
+            plot_x, plot_y, plot_ml, plot_dl = x, y, y_pred_ml, y_pred_dl
+        else:
+            plot_x, plot_y, plot_ml, plot_dl = x[keep], y[keep], y_pred_ml[keep], y_pred_dl[keep]
+            st.caption(f"📉 그래프에는 {len(y):,}개 점 가운데 모양을 대표하는 {len(keep):,}개만 그렸습니다.")
+        figure_args = (plot_x, plot_y, plot_ml, plot_dl, x_next, pred_ml_next, pred_dl_next,
+                       latex_equation_ml, latex_equation_dl, x_name, y_name,
+                       show_data, show_ml, show_dl, show_pred)
+        if use_altair():
+            comparison_altair(*figure_args).show()
+        else:
+            show_figure(comparison_figure(*figure_args))
         st.subheader("📝 데이터 분석 및 예측 결과 작성")
         analysis_text = st.text_area("데이터 분석 및 예측 결과를 작성하세요.", key="analysis")
         st.markdown("<hr style='border: 2px solid #2196F3;'>", unsafe_allow_html=True)
@@ -803,11 +770,11 @@ def show():
         st.subheader("📖 탐구 결과 및 해석")
         interpretation_text = st.text_area("탐구 결과 및 해석을 작성하세요.", key="interpretation")
         if st.button("📥 PDF 다운로드"):
-            pdf_bytes = create_pdf(
+            pdf_args = (
                 st.session_state["student_info"],
                 st.session_state.get("analysis", ""),
                 st.session_state.get("interpretation", ""),
-                comparison_df,  
+                comparison_df,
                 errors_df,
                 latex_equation_ml,
                 latex_equation_dl,
@@ -816,14 +783,35 @@ def show():
                 x_name,
                 y_name,
                 next_input,
-                fig=fig
-            )
-            st.download_button(
-                label="📄 PDF 저장하기",
-                data=pdf_bytes,
-                file_name="AI_탐구보고서.pdf",
-                mime="application/pdf"
             )
+            pdf_jobs.request(st.session_state, "pdf_job_d7", create_pdf, *pdf_args, figure_args,
+                             report.session_cache(st.session_state, "report_cache_d7"))
+        pdf_jobs.show_download(st.session_state, "pdf_job_d7", "📄 PDF 저장하기", "AI_탐구보고서.pdf")
+        st.download_button(
+            label="💾 제출 파일(JSON) 저장",
+            data=batch_export.submission_json(
+                7,
+                student_info=st.session_state["student_info"],
+                analysis=st.session_state.get("analysis", ""),
+                interpretation=st.session_state.get("interpretation", ""),
+                comparison=comparison_df[["모델", "SSE", "정확도"]].to_dict("records"),
+                latex_equation_ml=latex_equation_ml,
+                latex_equation_dl=latex_equation_dl,
+                pred_ml_next=float(pred_ml_next),
+                pred_dl_next=float(pred_dl_next),
+                x_name=x_name,
+                y_name=y_name,
+                next_input=float(next_input),
+                chart={
+                    "x": plot_x[:, 0].tolist(), "y": np.asarray(plot_y, dtype=float).tolist(),
+                    "y_pred_ml": np.asarray(plot_ml, dtype=float).tolist(),
+                    "y_pred_dl": np.asarray(plot_dl, dtype=float).ravel().tolist(),
+                },
+            ),
+            file_name="AI_탐구_제출.json",
+            mime="application/json",
+            key="submission_json_d7"
+        )
         st.markdown(
             "<div style='text-align: left; color:orange;'>✨실생활 데이터를 활용한 주제탐구 보고서를 작성하여 정해진 양식에 맞춰 제출하세요!</div>",
             unsafe_allow_html=True
@@ -0,0 +1,153 @@
+import hashlib
+import zipfile
+import csv
+import io
+import os
+from lazy import lazy_import
+from lru import LRUCache
+from model_cache import model_key
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# 업로드한 표를 내용 해시로 보관하는 개수 (같은 파일을 여러 학생이 올려도 한 번만 읽음)
+TABLE_CACHE_SIZE = int(os.environ.get("DATA_CACHE_SIZE", "8"))
+# CSV 인코딩은 이 순서로 시도 (엑셀에서 저장한 한글 CSV는 보통 cp949)
+ENCODINGS = ("utf-8-sig", "cp949")
+EXCEL_EXTENSIONS = (".xlsx", ".xlsm")
+# 이 행 수를 넘으면 큰 데이터 모드 (미리보기를 쪽 단위로 나누고 그래프의 점 수를 줄임)
+LARGE_DATA_ROWS = int(os.environ.get("LARGE_DATA_ROWS", "2000"))
+PREVIEW_ROWS = 100
+# 요약 통계를 계산할 때 한 번에 읽는 행 수
+STATS_CHUNK = 65536
+# 이상치 기준: IQR 방식은 [Q1 - k·IQR, Q3 + k·IQR] 밖, Z-Score 방식은 |Z| > 기준값
+IQR_K = 1.5
+Z_LIMIT = 3.0
+
+class DataError(ValueError):
+    """업로드한 파일을 표로 읽을 수 없는 경우 (메시지를 그대로 화면에 표시)"""
+
+_tables = LRUCache(maxsize=TABLE_CACHE_SIZE)
+_filtered = LRUCache(maxsize=TABLE_CACHE_SIZE)
+
+def _delimiter(sample):
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=",;\t").delimiter
+    except csv.Error:
+        return ","
+
+def _read_csv(data):
+    for encoding in ENCODINGS:
+        sample = data[:4096].decode(encoding, errors="ignore")
+        try:
+            return pd.read_csv(io.BytesIO(data), encoding=encoding, sep=_delimiter(sample))
+        except UnicodeDecodeError:
+            continue
+    raise DataError("파일 인코딩을 알 수 없습니다. UTF-8 또는 CP949(엑셀 기본)로 저장해 주세요.")
+
+def _read_excel(data):
+    try:
+        return pd.read_excel(io.BytesIO(data))
+    except ImportError:
+        raise DataError("이 서버에서는 엑셀 파일을 읽을 수 없습니다(openpyxl 없음). CSV로 저장해 올려 주세요.")
+
+def read_table(data, filename):
+    """업로드한 CSV·엑셀 파일(bytes)을 DataFrame으로 읽음 (결과는 공유되므로 수정하지 말 것)"""
+    ext = os.path.splitext(filename)[1].lower()
+    key = (hashlib.blake2b(data, digest_size=16).hexdigest(), ext)
+    table = _tables.get(key)
+    if table is None:
+        try:
+            table = _read_excel(data) if ext in EXCEL_EXTENSIONS else _read_csv(data)
+        except DataError:
+            raise
+        except (pd.errors.ParserError, pd.errors.EmptyDataError, zipfile.BadZipFile, ValueError) as e:
+            raise DataError(f"표를 읽지 못했습니다: {e}")
+        _tables.put(key, table)
+    return table
+
+def numeric_columns(table):
+    """숫자로 읽힌 열 이름 목록"""
+    return [col for col in table.columns if pd.api.types.is_numeric_dtype(table[col])]
+
+def xy_arrays(table, x_col, y_col):
+    """두 열을 (x 열벡터, y 배열, 제외한 행 수)로 변환 (비어 있거나 숫자가 아닌 행은 제외)"""
+    x = pd.to_numeric(table[x_col], errors="coerce").to_numpy(dtype=float)
+    y = pd.to_numeric(table[y_col], errors="coerce").to_numpy(dtype=float)
+    valid = ~(pd.isna(x) | pd.isna(y))
+    return x[valid].reshape(-1, 1), y[valid], int((~valid).sum())
+
+def is_large(n_rows):
+    return n_rows > LARGE_DATA_ROWS
+
+def summary_stats(x, y, chunk=STATS_CHUNK):
+    """x, y의 평균·표준편차(표본)·최솟값·최댓값·상관계수를 청크 단위로 한 번만 훑어 계산
+
+    청크마다 평균과 편차 제곱합을 구해 병합(Chan 방식)하므로 큰 데이터에서도 임시 배열이 chunk행을 넘지 않음.
+    반환값의 mean·std·min·max는 [x, y] 순서의 길이 2 배열
+    """
+    x = np.asarray(x, dtype=float).ravel()
+    y = np.asarray(y, dtype=float).ravel()
+    n, mean, m2, cxy = 0, np.zeros(2), np.zeros(2), 0.0
+    lo, hi = np.full(2, np.inf), np.full(2, -np.inf)
+    for start in range(0, len(x), chunk):
+        block = np.column_stack((x[start:start + chunk], y[start:start + chunk]))
+        k = len(block)
+        block_mean = block.mean(axis=0)
+        dev = block - block_mean
+        delta = block_mean - mean
+        total = n + k
+        m2 += (dev * dev).sum(axis=0) + delta ** 2 * n * k / total
+        cxy += (dev[:, 0] * dev[:, 1]).sum() + delta[0] * delta[1] * n * k / total
+        mean += delta * k / total
+        lo = np.minimum(lo, block.min(axis=0))
+        hi = np.maximum(hi, block.max(axis=0))
+        n = total
+    std = np.sqrt(m2 / (n - 1)) if n > 1 else np.full(2, np.nan)
+    corr = cxy / np.sqrt(m2[0] * m2[1]) if m2[0] > 0 and m2[1] > 0 else np.nan
+    return {"n": n, "mean": mean, "std": std, "min": lo, "max": hi, "corr": corr}
+
+def _iqr_mask(xy):
+    q1, q3 = np.percentile(xy, [25, 75], axis=0)
+    iqr = q3 - q1
+    return ((xy >= q1 - IQR_K * iqr) & (xy <= q3 + IQR_K * iqr)).all(axis=1)
+
+def _zscore_mask(xy):
+    # scipy.stats.zscore와 같이 모표준편차(ddof=0) 사용, 값이 모두 같은 열은 이상치 없음으로 처리
+    std = xy.std(axis=0)
+    z = np.abs(xy - xy.mean(axis=0)) / np.where(std > 0, std, 1.0)
+    return (z < Z_LIMIT).all(axis=1)
+
+# 화면에 보이는 방법 이름 → (x, y)를 열로 쌓은 배열에서 남길 행을 고르는 함수
+OUTLIER_FILTERS = {
+    "IQR 방식": _iqr_mask,
+    "Z-Score 방식": _zscore_mask,
+}
+
+def remove_outliers(x, y, methods):
+    """methods(OUTLIER_FILTERS의 이름) 순서로 이상치를 걸러 (x, y, [(방법, 제거한 수)])를 반환
+
+    모든 기준은 원본 데이터 하나로 계산하고 마스크를 합쳐 한 번만 골라냄. 각 방법의 제거 수는
+    앞 단계에서 이미 빠진 점을 제외한 수. 결과는 (데이터 해시, 방법)으로 세션 간에 캐시하므로 읽기 전용
+    """
+    methods = tuple(m for m in methods if m in OUTLIER_FILTERS)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if not methods:
+        return x, y, []
+    key = model_key(x, y, methods)
+    result = _filtered.get(key)
+    if result is None:
+        xy = np.column_stack((x.ravel(), y.ravel()))
+        keep = np.ones(len(xy), dtype=bool)
+        removed = []
+        for method in methods:
+            mask = OUTLIER_FILTERS[method](xy)
+            removed.append((method, int((keep & ~mask).sum())))
+            keep &= mask
+        x_kept, y_kept = x[keep], y[keep]
+        x_kept.setflags(write=False)
+        y_kept.setflags(write=False)
+        result = (x_kept, y_kept, removed)
+        _filtered.put(key, result)
+    return result
@@ -0,0 +1,65 @@
+import matplotlib as mpl
+import matplotlib.font_manager as fm
+import functools
+import io
+import os
+from lazy import lazy_import
+
+fpdf = lazy_import("fpdf")
+fpdf_fonts = lazy_import("fpdf.fonts")
+ttLib = lazy_import("fontTools.ttLib")
+
+FONT_PATH = os.path.join(os.path.dirname(__file__), "font", "NanumGothic.ttf")
+# 글꼴·이미지 재사용이 기대하는 fpdf2 내부 구조의 버전 (requirements.txt의 고정 버전과 같아야 함)
+FPDF_TESTED_VERSION = "2.7.9"
+_TTF_FONT_ATTRS = ("type", "name", "desc", "glyph_ids", "up", "ut", "cw", "ttffile", "emphasis", "scale", "cmap")
+
+@functools.lru_cache(maxsize=None)
+def register_korean_font():
+    """나눔고딕을 matplotlib에 한 번만 등록하고 기본 폰트로 지정"""
+    fm.fontManager.addfont(FONT_PATH)
+    font_name = fm.FontProperties(fname=FONT_PATH).get_name()
+    mpl.rc('font', family=font_name)
+    mpl.rc('axes', unicode_minus=False)
+    return font_name
+
+@functools.lru_cache(maxsize=None)
+def _pdf_font_template(path):
+    # 글리프 폭·cmap·글꼴 설명처럼 문서마다 같은 파싱 결과와 파일 내용을 프로세스당 한 번만 준비
+    with open(path, "rb") as f:
+        data = f.read()
+    probe = fpdf.FPDF()
+    probe.add_font("template", "", path)
+    return probe.fonts["template"], data
+
+def fpdf_internals_supported():
+    """설치된 fpdf2가 내부 구조를 직접 다루는 빠른 경로를 검증한 버전인지 여부"""
+    return fpdf.FPDF_VERSION == FPDF_TESTED_VERSION
+
+def add_pdf_font(pdf, family="Nanum", path=FONT_PATH):
+    """fpdf 문서에 TTF 글꼴을 추가 (파싱 결과는 재사용하고 서브셋만 문서마다 새로 만듦)
+
+    fpdf2 버전이 다르거나 필요한 속성이 없으면 재사용하지 않고 pdf.add_font로 처음부터 읽음
+    """
+    fontkey = family.lower()
+    if fontkey in pdf.fonts:
+        return
+    template, data = _pdf_font_template(str(path))
+    if not (fpdf_internals_supported() and hasattr(fpdf_fonts, "SubsetMap")
+            and all(hasattr(template, name) for name in _TTF_FONT_ATTRS)):
+        pdf.add_font(family, "", str(path))
+        return
+    font = object.__new__(fpdf_fonts.TTFFont)
+    for name in _TTF_FONT_ATTRS:
+        setattr(font, name, getattr(template, name))
+    font.i = len(pdf.fonts) + 1
+    font.fontkey = fontkey
+    font.missing_glyphs = []
+    # PDF 출력 시 서브셋 과정이 TTFont를 직접 수정하므로 메모리의 바이트에서 문서마다 새로 엶
+    font.ttfont = ttLib.TTFont(io.BytesIO(data), recalcTimestamp=False, fontNumber=0, lazy=True)
+    # add_font와 같은 규칙으로 공백·줄바꿈과 전체 페이지 수 자리표시자를 서브셋에 미리 넣어 둠
+    identities = "\x00 \r\n"
+    if pdf.str_alias_nb_pages:
+        identities += "0123456789" + pdf.str_alias_nb_pages
+    font.subset = fpdf_fonts.SubsetMap(font, [ord(char) for char in identities])
+    pdf.fonts[fontkey] = font
@@ -0,0 +1,30 @@
+import importlib
+import threading
+import types
+
+class LazyModule(types.ModuleType):
+    """처음 속성에 접근할 때 실제로 import되는 모듈 대리 객체"""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self._lazy_lock = threading.Lock()
+        self._lazy_module = None
+
+    def _load(self):
+        if self._lazy_module is None:
+            with self._lazy_lock:
+                if self._lazy_module is None:
+                    self._lazy_module = importlib.import_module(self.__name__)
+        return self._lazy_module
+
+    def is_loaded(self):
+        return self._lazy_module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+def lazy_import(name):
+    return LazyModule(name)
@@ -1,4 +1,13 @@
 import streamlit as st
+import importlib
+import runner
+import model_cache
+import charts
+import warmup
+import batch_export
+import pdf_jobs
+import io
+import os
 
 # 페이지 제목
 st.title(":rainbow[7days of Coding Mathematics]")
@@ -85,6 +94,10 @@ st.markdown(
     unsafe_allow_html=True
 )
 
+# 무거운 수업(6·7일차) 미리 준비 (WARMUP_HEAVY_LESSONS=1 일 때)
+if warmup.ENABLED:
+    warmup.start()
+
 # 드롭다운 메뉴 및 모듈 실행
 
 days = ["1Day - 🛠️파이썬 기초 배우기(자료형,리스트)", "2Day - 🛠️파이썬 기초 배우기(조건문&반복문, 알고리즘적 사고)", "3Day - 🔢파이썬으로 등차수열 다루기", "4Day - 🔢파이썬으로 등비수열 다루기", "5Day - 🔢파이썬으로 수열의 합 다루기", "6Day - ✨인공지능의 이해", "7Day - 🔮AI 예측 스튜디오", "Day M - 🧙‍♂️코드 마스터"]
@@ -128,7 +141,12 @@ st.selectbox(
     on_change=update_from_selectbox
 )
 
-module = __import__(modules[st.session_state.day])
+if warmup.ENABLED and modules[st.session_state.day] in warmup.HEAVY_LESSONS and not warmup.is_ready():
+    with st.spinner("⏳ AI 수업을 준비하고 있습니다. 잠시만 기다려 주세요..."):
+        warmup.wait()
+
+# 선택한 수업 모듈만 불러옵니다. (무거운 의존성은 각 모듈 안에서 지연 로딩)
+module = importlib.import_module(modules[st.session_state.day])
 module.show()
 
 # 이전 및 다음 버튼 (하단)
@@ -137,3 +155,37 @@ with col1:
     st.button("◀️ 이전", on_click=go_prev)
 with col3:
     st.button("다음 ▶️", on_click=go_next)
+
+# 서버 상태 (운영자용, SHOW_SERVER_STATS=1 일 때만 표시)
+if os.environ.get("SHOW_SERVER_STATS") == "1":
+    with st.sidebar.expander("🛠️ 서버 상태"):
+        st.markdown("**코드 실행 결과 캐시**")
+        st.json(runner.cache_stats())
+        st.markdown("**학습된 모델 저장소**")
+        st.json(model_cache.store_stats())
+        st.markdown("**차트 Figure**")
+        st.json(charts.figure_stats())
+        st.markdown("**PDF 작업 큐**")
+        st.json(pdf_jobs.stats())
+        if warmup.ENABLED:
+            st.markdown("**수업 준비 상태**")
+            st.json(warmup.status())
+
+# 학급 보고서 일괄 생성 (교사용, TEACHER_TOOLS=1 일 때만 표시)
+if os.environ.get("TEACHER_TOOLS") == "1":
+    with st.sidebar.expander("🗂️ 보고서 일괄 생성"):
+        uploads = st.file_uploader("학생 제출 파일(JSON)", type="json", accept_multiple_files=True, key="batch_uploads")
+        if uploads and st.button("📦 보고서 ZIP 만들기", key="batch_export"):
+            # 파일 하나에 여러 제출물이 있을 수 있어 먼저 모두 읽어 전체 개수로 진행률을 계산
+            failed = []
+            submissions = list(batch_export.parse_files(((u.name, u.getvalue()) for u in uploads), failed))
+            total = max(len(submissions), 1)
+            progress = st.progress(0.0)
+            # 화면에서는 ZIP 전체를 메모리에 담아 그대로 넘김 (CLI의 batch_export.py는 디스크에 바로 씀)
+            archive = io.BytesIO()
+            summary = batch_export.export_zip(
+                submissions, archive, failed=failed, on_progress=lambda n: progress.progress(min(n / total, 1.0))
+            )
+            archive.seek(0)
+            st.download_button("📄 ZIP 다운로드", data=archive, file_name="class_reports.zip", mime="application/zip")
+            st.caption(f"보고서 {summary['written']}개, 실패 {len(summary['failed'])}개")
@@ -0,0 +1,9 @@
+def markdown_table(data, code_columns=()):
+    """{열 이름: 값 목록} 딕셔너리를 마크다운 표로 변환 (code_columns 열의 값은 코드 글꼴로)"""
+    header = "| " + " | ".join(data) + " |"
+    divider = "|" + " --- |" * len(data)
+    rows = []
+    for values in zip(*data.values()):
+        cells = [f"`{v}`" if col in code_columns else str(v) for col, v in zip(data, values)]
+        rows.append("| " + " | ".join(cells) + " |")
+    return "\n".join([header, divider, *rows])
@@ -0,0 +1,87 @@
+import numpy as np
+import os
+
+# 딥러닝 백엔드 선택: "keras"(기본) 또는 "numpy" (DL_BACKEND 환경 변수)
+DL_BACKEND = os.environ.get("DL_BACKEND", "keras")
+
+def _activate(z, activation):
+    if activation == 'tanh':
+        return np.tanh(z)
+    if activation == 'relu':
+        return np.maximum(z, 0.0)
+    return z
+
+def _activate_grad(z, a, activation):
+    if activation == 'tanh':
+        return 1.0 - a ** 2
+    if activation == 'relu':
+        return (z > 0).astype(z.dtype)
+    return np.ones_like(z)
+
+class NumpyMLP:
+    """Keras Sequential(입력-h1-h2-1)과 같은 구조와 학습 방식(Adam, MSE)을 NumPy로 구현한 신경망"""
+
+    def __init__(self, n_inputs, hidden1, hidden2, activation='tanh', seed=0):
+        rng = np.random.default_rng(seed)
+        sizes = [n_inputs, hidden1, hidden2, 1]
+        self.activation = activation
+        self.weights = []
+        for fan_in, fan_out in zip(sizes[:-1], sizes[1:]):
+            # Keras 기본값과 같은 Glorot uniform 초기화, 편향은 0
+            limit = np.sqrt(6.0 / (fan_in + fan_out))
+            self.weights.append(rng.uniform(-limit, limit, size=(fan_in, fan_out)))
+            self.weights.append(np.zeros(fan_out))
+        self.history = []
+        self._rng = rng
+
+    def _forward(self, x):
+        W1, b1, W2, b2, W3, b3 = self.weights
+        z1 = x @ W1 + b1
+        a1 = _activate(z1, self.activation)
+        z2 = a1 @ W2 + b2
+        a2 = _activate(z2, self.activation)
+        return z1, a1, z2, a2, a2 @ W3 + b3
+
+    def _gradients(self, x, y):
+        W1, b1, W2, b2, W3, b3 = self.weights
+        z1, a1, z2, a2, out = self._forward(x)
+        diff = out - y
+        g3 = 2.0 * diff / diff.size
+        g2 = (g3 @ W3.T) * _activate_grad(z2, a2, self.activation)
+        g1 = (g2 @ W2.T) * _activate_grad(z1, a1, self.activation)
+        grads = [x.T @ g1, g1.sum(axis=0), a1.T @ g2, g2.sum(axis=0), a2.T @ g3, g3.sum(axis=0)]
+        return grads, float(np.mean(diff ** 2))
+
+    def fit(self, x, y, epochs, batch_size=32, learning_rate=0.01,
+            beta_1=0.9, beta_2=0.999, epsilon=1e-7, on_epoch_end=None):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float).reshape(len(x), -1)
+        n = len(x)
+        batch_size = min(batch_size or n, n)
+        m = [np.zeros_like(w) for w in self.weights]
+        v = [np.zeros_like(w) for w in self.weights]
+        step = 0
+        for epoch in range(epochs):
+            order = self._rng.permutation(n) if batch_size < n else np.arange(n)
+            losses = []
+            for start in range(0, n, batch_size):
+                idx = order[start:start + batch_size]
+                grads, loss = self._gradients(x[idx], y[idx])
+                losses.append(loss)
+                step += 1
+                lr_t = learning_rate * np.sqrt(1 - beta_2 ** step) / (1 - beta_1 ** step)
+                for w, g, m_i, v_i in zip(self.weights, grads, m, v):
+                    m_i += (1 - beta_1) * (g - m_i)
+                    v_i += (1 - beta_2) * (g * g - v_i)
+                    w -= lr_t * m_i / (np.sqrt(v_i) + epsilon)
+            self.history.append(float(np.mean(losses)))
+            # epoch마다 손실을 알려주고, False를 돌려받으면 학습 중단
+            if on_epoch_end is not None and on_epoch_end(epoch, self.history[-1]) is False:
+                break
+        return self
+
+    def predict(self, x):
+        return self._forward(np.asarray(x, dtype=float))[-1]
+
+    def get_weights(self):
+        return [w.copy() for w in self.weights]
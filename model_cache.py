@@ -0,0 +1,121 @@
+import hashlib
+import time
+import os
+from lru import LRUCache
+from lazy import lazy_import
+
+np = lazy_import("numpy")
+
+# 보관할 학습된 모델 수: 한 반(약 30명)이 각자 설정으로 학습한 모델을 한 개씩 담을 정도
+MAX_ENTRIES = int(os.environ.get("MODEL_CACHE_ENTRIES", "32"))
+# 모델 전체가 차지할 수 있는 메모리(MB): 작은 서버에서도 텐서플로와 함께 올라갈 수 있는 크기
+MAX_MB = int(os.environ.get("MODEL_CACHE_MB", "128"))
+# 저장된 모델을 버리기까지의 시간(초, 0이면 만료 없음): 수업 한 차시(약 30분)
+TTL = float(os.environ.get("MODEL_CACHE_TTL", "1800"))
+# keras 모델 하나가 가중치 외에 차지하는 대략적인 메모리 (모델·레이어 객체, 추적된 tf.function 그래프)
+KERAS_OVERHEAD_MB = float(os.environ.get("MODEL_CACHE_KERAS_OVERHEAD_MB", "2"))
+
+def model_key(*parts):
+    """배열(값·모양·자료형)과 하이퍼파라미터를 함께 해시한 캐시 키"""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if hasattr(part, "tobytes") and hasattr(part, "dtype"):
+            arr = np.ascontiguousarray(part)
+            h.update(f"{arr.dtype.str}{arr.shape}".encode())
+            h.update(arr.tobytes())
+        else:
+            h.update(repr(part).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+def _variables_nbytes(variables):
+    # 값을 복사하지 않고 모양과 자료형으로 크기를 계산 (numpy 배열, keras 변수 모두)
+    total = 0
+    for var in variables:
+        dtype = var.dtype
+        itemsize = getattr(dtype, "size", None) if not isinstance(dtype, str) else None
+        total += int(np.prod(var.shape)) * (itemsize or np.dtype(str(dtype)).itemsize)
+    return total
+
+def result_nbytes(result):
+    """(model, y_pred, ...) 결과의 대략적인 메모리 사용량 (추정값)
+
+    가중치와 예측값에 더해, keras 모델은 옵티마이저 상태(Adam은 가중치마다 m·v 두 벌)와
+    모델 객체 자체의 고정 비용(KERAS_OVERHEAD_MB)을 더함. NumpyMLP는 학습이 끝나면 옵티마이저 상태를 버림
+    """
+    model, y_pred = result[0], result[1]
+    nbytes = _variables_nbytes(model.weights) + np.asarray(y_pred).nbytes
+    optimizer = getattr(model, "optimizer", None)
+    if optimizer is not None:
+        variables = optimizer.variables
+        nbytes += _variables_nbytes(variables() if callable(variables) else variables)
+        nbytes += int(KERAS_OVERHEAD_MB * 1024 * 1024)
+    return nbytes
+
+class ModelStore(LRUCache):
+    """항목 수·메모리 사용량·보관 시간(TTL) 기준으로 오래된 모델부터 내보내는 LRU 저장소"""
+
+    def __init__(self, maxsize=MAX_ENTRIES, max_bytes=MAX_MB * 1024 * 1024, ttl=TTL):
+        super().__init__(maxsize)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.nbytes = 0
+        self.expired = 0
+        self._sizes = {}
+        self._stored_at = {}
+
+    def _remove(self, key):
+        del self._data[key]
+        del self._stored_at[key]
+        self.nbytes -= self._sizes.pop(key)
+
+    def _expire(self, now):
+        # 사용 여부와 관계없이 저장된 지 TTL이 지난 모델은 제거
+        if self.ttl <= 0:
+            return
+        for key in [k for k, t in self._stored_at.items() if now - t > self.ttl]:
+            self._remove(key)
+            self.expired += 1
+
+    def get(self, key, default=None):
+        with self._lock:
+            self._expire(time.monotonic())
+        return super().get(key, default)
+
+    def put(self, key, value, nbytes=0):
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = value
+            self._sizes[key] = nbytes
+            self._stored_at[key] = now
+            self.nbytes += nbytes
+            while self._data and (len(self._data) > self.maxsize or self.nbytes > self.max_bytes):
+                self._remove(next(iter(self._data)))
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._stored_at.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        with self._lock:
+            self._expire(time.monotonic())
+        stats = super().stats()
+        stats.update(bytes=self.nbytes, max_bytes=self.max_bytes, ttl=self.ttl, expired=self.expired)
+        return stats
+
+_store = ModelStore()
+
+def get_model(key):
+    return _store.get(key)
+
+def put_model(key, result):
+    _store.put(key, result, result_nbytes(result))
+
+def store_stats():
+    return _store.stats()
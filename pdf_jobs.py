@@ -0,0 +1,145 @@
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+import threading
+import time
+import uuid
+import os
+import streamlit as st
+
+# PDF를 동시에 만드는 작업 수: 글꼴·그래프 처리로 CPU를 많이 쓰므로 수업 화면이 느려지지 않게 작게 둠
+WORKERS = int(os.environ.get("PDF_WORKERS", "2"))
+# 대기할 수 있는 최대 요청 수: 한 반이 거의 동시에 보고서를 눌러도 받을 수 있고, 넘치면 바로 거절
+MAX_PENDING = int(os.environ.get("PDF_QUEUE_SIZE", "32"))
+# 끝난 작업(PDF 바이트)을 보관하는 시간(초)
+JOB_TTL = float(os.environ.get("PDF_JOB_TTL", "600"))
+POLL_SECONDS = 0.5
+
+class QueueFull(Exception):
+    """대기 중인 PDF 요청이 MAX_PENDING개를 넘은 경우"""
+
+class PdfJob:
+    """작업 큐에서 PDF를 만드는 작업 (세션에는 job_id만 저장)"""
+
+    def __init__(self, target, args):
+        self.id = uuid.uuid4().hex
+        self.status = "queued"
+        self.submitted_at = time.monotonic()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self._target = target
+        self._args = args
+
+    def run(self):
+        self.started_at = time.monotonic()
+        self.status = "running"
+        try:
+            self.result = self._target(*self._args)
+            self.status = "done"
+        except Exception as e:
+            self.error = f"{e.__class__.__name__}: {e}"
+            self.status = "failed"
+        finally:
+            self.finished_at = time.monotonic()
+            self._target = self._args = None
+            _finish(self)
+
+    def finished(self):
+        return self.status in ("done", "failed")
+
+_lock = threading.Lock()
+_executor = None
+_jobs = {}
+_latencies = deque(maxlen=200)
+_counts = {"submitted": 0, "done": 0, "failed": 0, "rejected": 0}
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="pdf")
+    return _executor
+
+def _finish(job):
+    with _lock:
+        _counts[job.status] += 1
+        _latencies.append((job.started_at - job.submitted_at, job.finished_at - job.started_at))
+
+def _expire(now):
+    for job_id in [j.id for j in _jobs.values() if j.finished() and now - j.finished_at > JOB_TTL]:
+        del _jobs[job_id]
+
+def _pending():
+    return sum(1 for job in _jobs.values() if not job.finished())
+
+def submit(target, *args):
+    """target(*args)가 PDF 바이트를 반환하는 작업을 큐에 넣고 job_id를 반환 (가득 차면 QueueFull)"""
+    with _lock:
+        _expire(time.monotonic())
+        if _pending() >= MAX_PENDING:
+            _counts["rejected"] += 1
+            raise QueueFull(f"대기 중인 PDF 요청이 {MAX_PENDING}개입니다.")
+        job = PdfJob(target, args)
+        _jobs[job.id] = job
+        _counts["submitted"] += 1
+        _get_executor().submit(job.run)
+    return job.id
+
+def get(job_id):
+    with _lock:
+        return _jobs.get(job_id)
+
+def queue_position(job):
+    """대기 중인 작업 앞에 남은 요청 수"""
+    with _lock:
+        return sum(1 for j in _jobs.values() if j.status == "queued" and j.submitted_at < job.submitted_at)
+
+def stats():
+    with _lock:
+        waits = [w for w, _ in _latencies]
+        runs = [r for _, r in _latencies]
+        return dict(
+            _counts,
+            workers=WORKERS,
+            max_pending=MAX_PENDING,
+            queued=sum(1 for j in _jobs.values() if j.status == "queued"),
+            running=sum(1 for j in _jobs.values() if j.status == "running"),
+            stored=len(_jobs),
+            avg_wait_ms=round(1000 * sum(waits) / len(waits), 1) if waits else None,
+            max_wait_ms=round(1000 * max(waits), 1) if waits else None,
+            avg_run_ms=round(1000 * sum(runs) / len(runs), 1) if runs else None,
+        )
+
+def request(state, slot, target, *args):
+    """버튼을 눌렀을 때 PDF 작업을 넣고 세션의 slot에 job_id를 기록 (큐가 가득 차면 안내만 표시)"""
+    try:
+        state[slot] = submit(target, *args)
+    except QueueFull:
+        st.warning("⏳ 지금 PDF 요청이 많습니다. 잠시 후 다시 눌러 주세요.")
+
+@st.fragment(run_every=POLL_SECONDS)
+def _poll(job_id):
+    # 이 부분만 주기적으로 다시 실행하며 진행 상태를 보여 주고, 끝나면 전체를 다시 그려 다운로드 버튼을 표시
+    job = get(job_id)
+    if job is None or job.finished():
+        st.rerun()
+    elif job.status == "queued":
+        st.info(f"⏳ PDF 대기 중... (앞에 {queue_position(job)}개)")
+    else:
+        st.info("📝 PDF를 만드는 중...")
+
+def show_download(state, slot, label, file_name, key=None):
+    """세션의 PDF 작업 상태를 보여 주고, 완성되면 다운로드 버튼을 표시"""
+    job_id = state.get(slot)
+    if job_id is None:
+        return
+    job = get(job_id)
+    if job is None:
+        # 보관 시간이 지나 정리된 작업
+        del state[slot]
+    elif job.status == "done":
+        st.download_button(label=label, data=job.result, file_name=file_name, mime="application/pdf", key=key)
+    elif job.status == "failed":
+        st.error(f"PDF를 만들지 못했습니다: {job.error}")
+    else:
+        _poll(job_id)
@@ -0,0 +1,164 @@
+import os
+from collections import namedtuple
+import numpy as np
+from model_cache import ModelStore, model_key
+
+# 회귀 결과 캐시 한도: 큰 데이터의 예측값 배열이 쌓여도 메모리를 넘지 않도록 바이트 수로도 제한
+CACHE_ENTRIES = int(os.environ.get("REGRESSION_CACHE_ENTRIES", "256"))
+CACHE_MB = int(os.environ.get("REGRESSION_CACHE_MB", "64"))
+
+_results = ModelStore(maxsize=CACHE_ENTRIES, max_bytes=CACHE_MB * 1024 * 1024, ttl=0)
+
+def _readonly(*arrays):
+    for arr in arrays:
+        arr.setflags(write=False)
+    return arrays
+
+def _cached(compute, x, y, *params):
+    # (x, y) 값과 매개변수를 해시한 키로 결과를 캐시 (배열을 튜플로 바꿔 키로 쓰지 않음)
+    x = np.asarray(x, dtype=float).ravel()
+    y = np.asarray(y, dtype=float).ravel()
+    key = model_key(compute.__name__, x, y, *params)
+    result = _results.get(key)
+    if result is None:
+        result = compute(x, y, *params)
+        _results.put(key, result, sum(v.nbytes for v in result if isinstance(v, np.ndarray)))
+    return result
+
+class PolyFit(namedtuple("PolyFit", ["coef", "intercept", "y_pred", "sse", "r2", "latex", "center", "scale", "coef_scaled"])):
+    """다항 회귀 결과 (coef는 x, x², ... 순서의 계수)"""
+    __slots__ = ()
+
+    def predict(self, x):
+        t = (np.asarray(x, dtype=float).ravel() - self.center) / self.scale
+        return np.polynomial.polynomial.polyval(t, self.coef_scaled)
+
+def poly_latex(coefs, intercept, tol=1e-8):
+    """계수(x, x², ... 순서)와 절편을 차수가 높은 항부터 쓴 LaTeX 식으로 변환"""
+    terms = []
+    for degree, c in reversed(list(enumerate(coefs, start=1))):
+        if abs(c) < tol:
+            continue
+        terms.append(f"{c:.2f}x" if degree == 1 else f"{c:.2f}x^{{{degree}}}")
+    if abs(intercept) >= tol or not terms:
+        terms.append(f"{intercept:.2f}")
+    return "y = " + " + ".join(terms).replace("+ -", "- ")
+
+def r2_score(y, y_pred):
+    y = np.asarray(y, dtype=float).ravel()
+    sse = np.sum((y - np.asarray(y_pred, dtype=float).ravel()) ** 2)
+    sst = np.sum((y - y.mean()) ** 2)
+    if sst == 0:
+        return 1.0 if sse == 0 else 0.0
+    return 1.0 - sse / sst
+
+class MinMaxScaler:
+    """열마다 [0, 1] 범위로 바꾸는 스케일러 (sklearn MinMaxScaler와 같은 사용법)"""
+
+    def fit(self, X):
+        X = np.asarray(X, dtype=float)
+        self.data_min_ = X.min(axis=0)
+        data_range = X.max(axis=0) - self.data_min_
+        self.scale_ = np.where(data_range == 0, 1.0, data_range)
+        return self
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=float) - self.data_min_) / self.scale_
+
+    def fit_transform(self, X):
+        return self.fit(X).transform(X)
+
+    def inverse_transform(self, X):
+        return np.asarray(X, dtype=float) * self.scale_ + self.data_min_
+
+def _fit_polynomial(x, y, degree):
+    # x를 [-1, 1] 근처로 옮긴 뒤 Vandermonde 행렬을 QR 분해로 풀어 연도 같은 큰 x에서도 안정적으로 계산
+    center = (x.max() + x.min()) / 2
+    scale = (x.max() - x.min()) / 2 or 1.0
+    V = np.vander((x - center) / scale, degree + 1, increasing=True)
+    Q, R = np.linalg.qr(V)
+    diag = np.abs(np.diag(R))
+    if len(x) > degree and diag.min() > 1e-10 * diag.max():
+        coef_scaled = np.linalg.solve(R, Q.T @ y)
+    else:
+        # 데이터 수가 차수보다 적으면 최소 노름 해 사용
+        coef_scaled = np.linalg.lstsq(V, y, rcond=None)[0]
+    y_pred = V @ coef_scaled
+    raw = np.polynomial.Polynomial(coef_scaled, domain=[center - scale, center + scale]).convert().coef
+    raw = np.pad(raw, (0, degree + 1 - len(raw)))
+    coef, intercept = raw[1:], float(raw[0])
+    sse = float(np.sum((y - y_pred) ** 2))
+    _readonly(coef, y_pred, coef_scaled)
+    return PolyFit(coef, intercept, y_pred, sse, r2_score(y, y_pred), poly_latex(coef, intercept),
+                   center, scale, coef_scaled)
+
+def fit_polynomial(x, y, degree):
+    """다항 회귀를 한 번에 계산해 계수·예측값·SSE·R²·LaTeX 식을 반환 ((x, y, 차수)별로 캐시)"""
+    return _cached(_fit_polynomial, x, y, int(degree))
+
+# 차수 자동 선택 결과: 후보 차수별 LOOCV 평균제곱오차와 SSE, 가장 좋은 차수
+DegreeSelection = namedtuple("DegreeSelection", ["degrees", "cv_mse", "sse", "best_degree"])
+
+def _select_degree(x, y, max_degree):
+    center = (x.max() + x.min()) / 2
+    scale = (x.max() - x.min()) / 2 or 1.0
+    V = np.vander((x - center) / scale, max_degree + 1, increasing=True)
+    # QR의 앞쪽 d+1개 열이 d차 모델의 열공간이므로, 누적합 한 번으로 모든 차수의 예측값과 hat 행렬 대각을 구함
+    Q, _ = np.linalg.qr(V)
+    y_hats = np.cumsum(Q * (Q.T @ y), axis=1)[:, 1:]
+    leverage = np.cumsum(Q ** 2, axis=1)[:, 1:]
+    residuals = y[:, None] - y_hats
+    with np.errstate(divide="ignore", invalid="ignore"):
+        loo = residuals / (1.0 - leverage)
+    cv_mse = np.mean(loo ** 2, axis=0)
+    cv_mse[~np.isfinite(cv_mse)] = np.nan
+    degrees = np.arange(1, max_degree + 1)
+    sse = np.sum(residuals ** 2, axis=0)
+    if np.isnan(cv_mse).all():
+        # 모든 점의 leverage가 1이면(점이 너무 적은 경우) LOOCV를 계산할 수 없으므로 1차로 둠
+        best = 1
+    else:
+        # 오차가 사실상 같으면(완전히 맞는 경우 등) 더 단순한 낮은 차수를 선택
+        threshold = np.nanmin(cv_mse) + 1e-9 * (np.mean(y ** 2) + 1e-12)
+        best = int(degrees[np.argmax(cv_mse <= threshold)])
+    _readonly(degrees, cv_mse, sse)
+    return DegreeSelection(degrees, cv_mse, sse, best)
+
+def select_degree(x, y, max_degree=5):
+    """1~max_degree차 모델을 한 번에 적합하고 LOOCV 오차가 가장 작은 차수를 선택"""
+    # 한 점을 빼고도 적합할 수 있도록 데이터 수보다 충분히 작은 차수까지만 후보로 사용하고,
+    # x 값이 겹치면 서로 다른 x 개수 - 1차를 넘는 모델은 계수가 정해지지 않으므로 제외
+    distinct = np.unique(np.asarray(x, dtype=float)).size
+    max_degree = max(1, min(int(max_degree), np.size(x) - 2, distinct - 1))
+    return _cached(_select_degree, x, y, max_degree)
+
+# 경사하강법 학습 기록: epoch 0(초기값)부터 epochs까지의 계수·절편·예측값·SSE
+GDTrace = namedtuple("GDTrace", ["coefs", "intercepts", "y_hats", "sse"])
+
+def _gd_trace(x, y, degree, epochs):
+    n = len(x)
+    powers = x[:, None] ** np.arange(1, degree + 1)
+    # 차수별 특성을 표준화해야 높은 차수에서도 학습률 하나로 안정적으로 수렴
+    mu = powers.mean(axis=0)
+    sd = powers.std(axis=0)
+    sd[sd == 0] = 1.0
+    Z = np.hstack([np.ones((n, 1)), (powers - mu) / sd])
+    # MSE 경사하강법 w(t+1) = w(t) - lr·(A·w(t) - b) 의 해를 고유분해로 모든 epoch에 대해 한 번에 계산
+    A = 2.0 / n * Z.T @ Z
+    b = 2.0 / n * Z.T @ y
+    lam, V = np.linalg.eigh(A)
+    lr = 1.0 / lam.max()
+    t = np.arange(epochs + 1)[:, None]
+    safe_lam = np.where(lam > 1e-12, lam, 1.0)
+    gain = np.where(lam > 1e-12, (1 - (1 - lr * lam) ** t) / safe_lam, lr * t)
+    W = (gain * (V.T @ b)) @ V.T
+    y_hats = W @ Z.T
+    sse = ((y_hats - y) ** 2).sum(axis=1)
+    # 표준화된 계수를 원래 x의 거듭제곱 계수로 되돌림
+    coefs = W[:, 1:] / sd
+    intercepts = W[:, 0] - coefs @ mu
+    return GDTrace(*_readonly(coefs, intercepts, y_hats, sse))
+
+def gd_trace(x, y, degree, epochs):
+    """다항 회귀를 경사하강법으로 학습할 때 epoch별 상태를 모두 계산 (수열·차수별로 캐시)"""
+    return _cached(_gd_trace, x, y, int(degree), int(epochs))
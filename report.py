@@ -0,0 +1,297 @@
+import functools
+import hashlib
+import io
+import os
+from collections import namedtuple
+from datetime import datetime
+from lazy import lazy_import
+from lru import LRUCache
+from fonts import add_pdf_font, fpdf_internals_supported
+from model_cache import model_key
+from charts import release_figure
+
+fpdf = lazy_import("fpdf")
+
+FONT_FAMILY = "Nanum"
+C_PRIMARY = (25, 118, 210)
+C_PRIMARY_LT = (227, 242, 253)
+C_HEADING = (21, 101, 192)
+C_TEXT = (33, 33, 33)
+C_BORDER = (200, 200, 200)
+C_TEXT_MUTED = (120, 120, 120)
+# PDF에 들어가는 그림의 인쇄 해상도 (페이지 너비에 맞춰 savefig dpi를 계산)
+FIGURE_PPI = int(os.environ.get("REPORT_FIGURE_PPI", "150"))
+# 세션마다 보관하는 보고서 조각(그림 PNG·해석한 이미지·완성된 PDF) 수
+CACHE_SIZE = int(os.environ.get("REPORT_CACHE_SIZE", "8"))
+
+# 보고서의 한 구역: kind에 따라 content의 형태가 다름 (text·card는 줄 목록, table은 (headers, rows, highlight) 등)
+Section = namedtuple("Section", ["kind", "title", "content"])
+
+def text(title, *paragraphs):
+    """제목 아래에 문단을 차례로 쓰는 구역"""
+    return Section("text", title, paragraphs)
+
+def student_info(info):
+    return text(
+        "👤 학생 정보",
+        f"학교: {info.get('school','')}",
+        f"학번: {info.get('id','')}",
+        f"이름: {info.get('name','')}",
+        f"작성일: {datetime.now().strftime('%Y-%m-%d')}",
+    )
+
+def key_values(title, pairs):
+    """(키, 값) 쌍을 2열 표로 보여 주는 카드"""
+    return Section("key_values", title, tuple(pairs))
+
+def card(title, lines):
+    """테두리 상자 안에 여러 줄을 쓰는 카드"""
+    return Section("card", title, tuple(lines))
+
+def table(title, headers, rows, highlight_row=None):
+    return Section("table", title, (tuple(headers), [list(row) for row in rows], highlight_row))
+
+def figure(title, fig):
+    """matplotlib Figure 또는 이미 만든 PNG 바이트를 싣는 구역"""
+    return Section("figure", title, fig)
+
+def figure_from(title, draw, *args):
+    """draw(*args)가 그리는 Figure를 싣는 구역 (캐시가 있으면 입력이 같을 때 다시 그리지 않음)"""
+    return Section("figure", title, (draw, args))
+
+def figure_dpi(fig, width_mm):
+    """너비 width_mm로 놓일 Figure가 FIGURE_PPI 해상도가 되도록 하는 dpi"""
+    return max(72, round(width_mm / 25.4 * FIGURE_PPI / fig.get_size_inches()[0]))
+
+def page_break():
+    return Section("page_break", None, None)
+
+def spacer(height):
+    return Section("spacer", None, height)
+
+def session_cache(state, slot="report_cache"):
+    """세션(state)에 두는 보고서 캐시 (PDF 작업 스레드에서 함께 써도 안전한 LRUCache)"""
+    if slot not in state:
+        state[slot] = LRUCache(maxsize=CACHE_SIZE)
+    return state[slot]
+
+def _figure_key(content):
+    draw, args = content
+    return model_key(draw.__module__, draw.__qualname__, FIGURE_PPI, *args)
+
+def _savefig(fig, width_mm):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight", dpi=figure_dpi(fig, width_mm))
+    return buffer.getvalue()
+
+def _figure_png(content, width_mm, cache):
+    # 임시 파일 없이 메모리에서 PNG를 만듦 (figure_from 구역은 입력값 해시로 캐시)
+    if isinstance(content, bytes):
+        return content
+    if not isinstance(content, tuple):
+        return _savefig(content, width_mm)
+    key = ("figure", _figure_key(content))
+    png = cache.get(key) if cache is not None else None
+    if png is None:
+        draw, args = content
+        fig = draw(*args)
+        try:
+            png = _savefig(fig, width_mm)
+        finally:
+            release_figure(fig)
+        if cache is not None:
+            cache.put(key, png)
+    return png
+
+def _report_key(spec):
+    # 구역 내용 전체의 해시 (matplotlib Figure를 직접 넣은 보고서는 키를 만들 수 없어 None)
+    parts = [repr({k: v for k, v in spec.items() if k != "sections"})]
+    for kind, title, content in spec["sections"]:
+        parts += [kind, title]
+        if kind != "figure" or content is None:
+            parts.append(repr(content))
+        elif isinstance(content, bytes):
+            parts.append(hashlib.blake2b(content, digest_size=16).hexdigest())
+        elif isinstance(content, tuple):
+            parts.append(_figure_key(content))
+        else:
+            return None
+    return model_key(*parts)
+
+@functools.lru_cache(maxsize=None)
+def _report_pdf_class():
+    # fpdf는 PDF를 처음 만들 때 불러옵니다.
+    class ReportPDF(fpdf.FPDF):
+        def __init__(self, spec, cache=None):
+            super().__init__()
+            self.spec = spec
+            self.cache = cache
+            self.alias_nb_pages()
+            self.set_auto_page_break(auto=True, margin=15)
+            add_pdf_font(self, FONT_FAMILY)
+
+        def header(self):
+            band = self.spec.get("band_height", 20)
+            self.set_fill_color(*C_PRIMARY)
+            self.rect(0, 0, self.w, band, 'F')
+            self.set_xy(10, 6)
+            self.set_text_color(255, 255, 255)
+            self.set_font(FONT_FAMILY, '', self.spec.get("title_size", 16))
+            self.cell(0, 10, self.spec["title"], ln=1, align='C')
+            self.set_text_color(*C_TEXT)
+            self.ln(self.spec.get("header_gap", 15))
+
+        def footer(self):
+            self.set_y(-15)
+            self.set_draw_color(*C_BORDER)
+            self.set_line_width(0.2)
+            self.line(10, self.get_y(), self.w - 10, self.get_y())
+            self.set_y(-12)
+            self.set_font(FONT_FAMILY, '', 9)
+            self.set_text_color(*C_TEXT_MUTED)
+            if self.spec.get("footer"):
+                self.cell(0, 8, self.spec["footer"], 0, 0, 'L')
+            self.cell(0, 8, f"{self.page_no()} / {{nb}}", 0, 0, 'R')
+
+        def h2(self, text):
+            self.set_fill_color(*C_PRIMARY_LT)
+            self.set_text_color(*C_HEADING)
+            self.set_font(FONT_FAMILY, '', 12)
+            self.cell(0, 9, text, ln=1, fill=True)
+            self.ln(2)
+            self.set_text_color(*C_TEXT)
+
+        def p(self, text, size=11, lh=6):
+            self.set_font(FONT_FAMILY, '', size)
+            self.multi_cell(0, lh, text)
+            self.ln(1)
+
+        def kv_card(self, title, kv_pairs):
+            self.h2(title)
+            self.set_draw_color(*C_BORDER)
+            self.set_line_width(0.3)
+            self.set_font(FONT_FAMILY, '', 11)
+            self.set_fill_color(255, 255, 255)
+            col_w = (self.w - 20) / 2
+            cell_h = 8
+            # 홀수 개면 빈 칸을 채워 2열을 맞춤
+            pairs = list(kv_pairs) + [("", "")] * (len(kv_pairs) % 2)
+            for i, (k, v) in enumerate(pairs):
+                if i % 2 == 0 and i > 0:
+                    self.ln(cell_h)
+                self.set_x(10 + (i % 2) * col_w)
+                self.set_text_color(*C_TEXT_MUTED)
+                self.cell(col_w * 0.35, cell_h, str(k), border=1)
+                self.set_text_color(*C_TEXT)
+                self.cell(col_w * 0.65, cell_h, str(v), border=1)
+            self.ln(cell_h)
+            self.ln(2)
+
+        def info_card(self, title, lines):
+            self.h2(title)
+            self.set_draw_color(*C_BORDER)
+            self.set_line_width(0.3)
+            self.set_font(FONT_FAMILY, '', 11)
+            x, y = 10, self.get_y()
+            w = self.w - 20
+            for line in lines:
+                self.set_x(12)
+                self.multi_cell(w - 4, 7, line)
+            self.rect(x, y, w, self.get_y() - y)
+            self.ln(2)
+
+        def table(self, headers, rows, highlight_row_idx=None, zebra=True):
+            self.set_font(FONT_FAMILY, '', 11)
+            cell_h = 8
+            col_w = (self.w - 20) / len(headers)
+            self.set_fill_color(240, 244, 248)
+            self.set_text_color(*C_HEADING)
+            for h in headers:
+                self.cell(col_w, cell_h, str(h), border=1, align='C', fill=True)
+            self.ln(cell_h)
+            self.set_text_color(*C_TEXT)
+            for i, row in enumerate(rows):
+                if i == highlight_row_idx:
+                    self.set_fill_color(255, 249, 196)
+                elif zebra and i % 2 == 1:
+                    self.set_fill_color(250, 250, 250)
+                else:
+                    self.set_fill_color(255, 255, 255)
+                for val in row:
+                    self.cell(col_w, cell_h, str(val), border=1, align='C', fill=True)
+                self.ln(cell_h)
+            self.ln(2)
+
+        def image_figure(self, fig):
+            width = self.w - 20
+            png = _figure_png(fig, width, self.cache)
+            # fpdf는 PNG 바이트의 md5로 이미지를 구분하고, 처음 볼 때 PNG 전체를 해석(압축 해제·재압축)함
+            name = hashlib.md5(png.strip(), usedforsecurity=False).hexdigest()
+            key = ("image", name)
+            images = getattr(getattr(self, "image_cache", None), "images", None)
+            # 내부 구조가 다른 fpdf2에서는 캐시한 PNG 바이트만 재사용하고 해석은 fpdf에 맡김
+            reuse = self.cache is not None and fpdf_internals_supported() and isinstance(images, dict)
+            info = None
+            if reuse and name not in images:
+                info = self.cache.get(key)
+                if info is not None:
+                    # 이전 보고서에서 해석해 둔 정보를 복사해 넣어 해석을 건너뜀 (출력 시 읽기만 함)
+                    images[name] = type(info)(info, i=len(images) + 1, usages=0)
+            self.image(io.BytesIO(png), x=10, w=width)
+            if reuse and info is None and isinstance(images.get(name), dict) and not images[name].get("iccp"):
+                self.cache.put(key, type(images[name])(images[name]))
+            self.ln(3)
+
+        def section(self, section):
+            kind, title, content = section
+            if kind == "text":
+                self.h2(title)
+                for paragraph in content:
+                    self.p(paragraph)
+            elif kind == "key_values":
+                self.kv_card(title, content)
+            elif kind == "card":
+                self.info_card(title, content)
+            elif kind == "table":
+                headers, rows, highlight = content
+                self.h2(title)
+                self.table(headers, rows, highlight_row_idx=highlight)
+            elif kind == "figure":
+                if content is not None:
+                    self.h2(title)
+                    self.image_figure(content)
+            elif kind == "page_break":
+                self.add_page()
+            elif kind == "spacer":
+                self.ln(content)
+            else:
+                raise ValueError(f"알 수 없는 보고서 구역: {kind}")
+    return ReportPDF
+
+def build_report(spec, cache=None):
+    """보고서 명세(dict)를 PDF 바이트로 변환
+
+    spec 키: title(머리글 제목), sections(Section 목록), footer(바닥글 왼쪽 문구),
+    title_size·band_height·header_gap(머리글 모양), metadata(set_title 등 문서 정보)
+
+    cache(session_cache)를 주면 내용 해시로 구역을 재사용: 바뀐 것이 없으면 이전 PDF를 그대로 돌려주고,
+    글만 고쳤으면 그림(PNG 렌더링·해석)은 캐시에서 가져와 글과 표만 다시 배치함
+    """
+    key = ("pdf", _report_key(spec)) if cache is not None else None
+    if key is not None and key[1] is not None:
+        data = cache.get(key)
+        if data is not None:
+            return data
+    pdf = _report_pdf_class()(spec, cache)
+    for name, value in spec.get("metadata", {}).items():
+        getattr(pdf, f"set_{name}")(value)
+    pdf.add_page()
+    for section in spec["sections"]:
+        pdf.section(section)
+    data = bytes(pdf.output(dest='S'))
+    if key is not None and key[1] is not None:
+        cache.put(key, data)
+    return data
+
+def footer_text(info):
+    return f"{info.get('school','')} • {info.get('name','')}"
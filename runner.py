@@ -0,0 +1,268 @@
+import multiprocessing as mp
+import threading
+import contextvars
+import hashlib
+import signal
+import queue
+import ast
+import re
+import io
+import sys
+import os
+from lru import LRUCache
+
+try:
+    import resource
+except ImportError:  # Windows 등 resource 모듈이 없는 환경
+    resource = None
+
+# 미리 띄워 둘 실행 프로세스 수 (동시에 실행할 수 있는 학생 코드 수, 0이면 서버 프로세스에서 바로 실행)
+WORKERS = int(os.environ.get("CODE_RUNNER_WORKERS", "4"))
+# 코드 한 번의 최대 실행 시간(초): 수업 예제는 1초 안에 끝나므로 무한 루프만 끊을 만큼 여유를 둠
+TIMEOUT = float(os.environ.get("CODE_RUNNER_TIMEOUT", "5"))
+# 실행 프로세스 하나의 주소 공간 한도(MB): 파이썬 자체와 작은 리스트·문자열 연습에 충분한 크기
+MEMORY_MB = int(os.environ.get("CODE_RUNNER_MEMORY_MB", "256"))
+# 결과를 캐시할 코드 수와 캐시할 출력 하나의 최대 크기(바이트): 기본값이면 캐시 전체가 64MB를 넘지 않음
+CACHE_SIZE = int(os.environ.get("CODE_RUNNER_CACHE_SIZE", "1024"))
+CACHE_MAX_OUTPUT = int(os.environ.get("CODE_RUNNER_CACHE_MAX_OUTPUT", str(64 * 1024)))
+
+# 실행할 때마다 결과가 같다고 볼 수 있는 모듈 (이 외의 import가 있으면 캐시하지 않음)
+_PURE_MODULES = {
+    "math", "cmath", "itertools", "functools", "operator", "collections",
+    "fractions", "decimal", "statistics", "string", "re", "heapq", "bisect",
+}
+# 입력·파일·동적 실행 등 결과가 달라질 수 있는 이름
+_IMPURE_NAMES = {
+    "input", "open", "exec", "eval", "compile", "__import__", "breakpoint",
+    "globals", "locals", "vars", "getattr", "setattr", "delattr", "help",
+    "id", "hash", "__builtins__",
+    # 집합의 순회·출력 순서는 문자열 해시에 따라 프로세스마다 달라짐 (PYTHONHASHSEED)
+    "set", "frozenset",
+}
+# decimal 문맥은 프로세스 전역 상태라 바꾸면 같은 코드도 결과가 달라짐 (이름·속성 모두 확인)
+_CONTEXT_NAMES = {"getcontext", "setcontext", "localcontext"}
+_SET_OPERATORS = (ast.BitAnd, ast.BitOr, ast.BitXor, ast.Sub)
+# 기본 repr(<A object at 0x...>, <function f at 0x...>)에는 실행마다 바뀌는 메모리 주소가 들어감
+_ADDRESS_REPR = re.compile(r" at 0x[0-9a-fA-F]+>")
+
+class ExecutionAborted(Exception):
+    """시간 초과나 프로세스 종료로 학생 코드가 끝까지 실행되지 못한 경우"""
+
+class _StdoutProxy:
+    """실행 중인 컨텍스트의 버퍼로 출력을 보내고, 그 외에는 원래 stdout으로 보내는 프록시"""
+
+    def __init__(self, default):
+        self._default = default
+
+    def _target(self):
+        return _current_output.get() or self._default
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._target(), name)
+
+_current_output = contextvars.ContextVar("code_runner_output", default=None)
+_proxy_lock = threading.Lock()
+
+def _install_stdout_proxy():
+    with _proxy_lock:
+        if not isinstance(sys.stdout, _StdoutProxy):
+            sys.stdout = _StdoutProxy(sys.stdout)
+
+def _execute(code_input):
+    _install_stdout_proxy()
+    output_buffer = io.StringIO()
+
+    def run_print(*args, file=None, **kwargs):
+        print(*args, file=output_buffer if file is None else file, **kwargs)
+
+    result, status = "", "success"
+    token = _current_output.set(output_buffer)
+    try:
+        exec_globals = {"print": run_print}
+        exec(code_input, exec_globals)
+        result = output_buffer.getvalue() or "출력된 내용이 없습니다."
+    except SystemExit as e:
+        # exit()·quit()가 워커 프로세스를 끝내지 않도록 잡고, 그때까지의 출력은 함께 돌려줌
+        result = output_buffer.getvalue() + f"{e.__class__.__name__}: {e}"
+        status = "error"
+    except Exception as e:
+        result = f"{e.__class__.__name__}: {e}"
+        status = "error"
+    finally:
+        _current_output.reset(token)
+    return result, status
+
+def _limit_memory(memory_mb):
+    if resource is None or memory_mb <= 0:
+        return
+    limit = memory_mb * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError):
+        pass
+
+# 작업마다 워커에서 fork한 자식이 코드를 실행하면, 학생이 바꾼 모듈 속성·decimal 문맥 등이 다음 실행에 남지 않음
+_FORK_PER_RUN = hasattr(os, "fork")
+
+def _run_forked(code_input, timeout):
+    reader, writer = mp.Pipe(duplex=False)
+    pid = os.fork()
+    if pid == 0:
+        reader.close()
+        try:
+            writer.send(_execute(code_input))
+        finally:
+            os._exit(0)
+    writer.close()
+    try:
+        if not reader.poll(timeout):
+            os.kill(pid, signal.SIGKILL)
+            return ExecutionAborted(f"TimeoutError: 실행 시간이 {timeout:g}초를 초과했습니다.")
+        return reader.recv()
+    except (EOFError, OSError):
+        # 메모리 초과 등으로 실행 프로세스가 죽은 경우 (워커는 그대로 다음 작업을 받음)
+        return ExecutionAborted("RuntimeError: 실행 프로세스가 비정상 종료되었습니다.")
+    finally:
+        reader.close()
+        os.waitpid(pid, 0)
+
+def _worker_main(conn, memory_mb, timeout):
+    _limit_memory(memory_mb)
+    while True:
+        try:
+            code_input = conn.recv()
+        except (EOFError, OSError):
+            break
+        if not _FORK_PER_RUN:
+            # fork가 없으면 한 번만 실행하고 끝내 풀이 새 프로세스로 교체하게 함
+            conn.send(_execute(code_input))
+            break
+        conn.send(_run_forked(code_input, timeout))
+
+class _Worker:
+    def __init__(self, ctx, memory_mb, timeout):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, memory_mb, timeout), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join(timeout=1)
+        self.conn.close()
+
+class WorkerPool:
+    """미리 띄워 둔 파이썬 프로세스에서 학생 코드를 실행하는 풀 (실행마다 깨끗한 인터프리터 상태에서 시작)"""
+
+    def __init__(self, size=WORKERS, timeout=TIMEOUT, memory_mb=MEMORY_MB):
+        methods = mp.get_all_start_methods()
+        self._ctx = mp.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self._idle = queue.Queue()
+        for _ in range(size):
+            self._idle.put(self._new_worker())
+
+    def _new_worker(self):
+        return _Worker(self._ctx, self.memory_mb, self.timeout)
+
+    def run(self, code_input):
+        worker = self._idle.get()
+        try:
+            worker.conn.send(code_input)
+            # 시간 초과는 워커가 실행 프로세스를 끊어 처리하고, 여기서는 워커 자체가 멈춘 경우만 대비
+            if not worker.conn.poll(self.timeout + 1):
+                worker.kill()
+                worker = self._new_worker()
+                raise ExecutionAborted(f"TimeoutError: 실행 시간이 {self.timeout:g}초를 초과했습니다.")
+            reply = worker.conn.recv()
+            if not _FORK_PER_RUN:
+                worker.kill()
+                worker = self._new_worker()
+            if isinstance(reply, ExecutionAborted):
+                raise reply
+            return reply
+        except (EOFError, OSError):
+            # 메모리 초과 등으로 프로세스가 죽은 경우 새 프로세스로 교체
+            worker.kill()
+            worker = self._new_worker()
+            raise ExecutionAborted("RuntimeError: 실행 프로세스가 비정상 종료되었습니다.")
+        finally:
+            self._idle.put(worker)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WorkerPool()
+        return _pool
+
+_result_cache = LRUCache(maxsize=CACHE_SIZE)
+
+def _is_dict_view(node):
+    return (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+            and node.func.attr in ("keys", "items"))
+
+def _is_deterministic(tree):
+    for node in ast.walk(tree):
+        # 집합 리터럴·컴프리헨션과 dict 뷰의 집합 연산(결과가 set)은 워커마다 순서가 달라 캐시하지 않음
+        if isinstance(node, (ast.Set, ast.SetComp)):
+            return False
+        if (isinstance(node, ast.BinOp) and isinstance(node.op, _SET_OPERATORS)
+                and (_is_dict_view(node.left) or _is_dict_view(node.right))):
+            return False
+        if isinstance(node, ast.Import):
+            if any(alias.name.split(".")[0] not in _PURE_MODULES for alias in node.names):
+                return False
+        elif isinstance(node, ast.ImportFrom):
+            if node.level or (node.module or "").split(".")[0] not in _PURE_MODULES:
+                return False
+        elif isinstance(node, ast.Name) and (node.id in _IMPURE_NAMES or node.id in _CONTEXT_NAMES):
+            return False
+        elif isinstance(node, ast.Attribute):
+            # 모듈·객체 속성을 바꾸거나 지우는 코드(math.pi = 3 등)와 문맥 접근(decimal.getcontext())은 캐시하지 않음
+            if (node.attr.startswith("__") or node.attr in _CONTEXT_NAMES
+                    or isinstance(node.ctx, (ast.Store, ast.Del))):
+                return False
+    return True
+
+def _cache_key(code_input):
+    """결정적인 코드라면 주석·공백을 제거한 AST 기준 해시를, 아니면 None을 반환"""
+    try:
+        tree = ast.parse(code_input)
+    except (SyntaxError, ValueError):
+        return None
+    if not _is_deterministic(tree):
+        return None
+    return hashlib.sha256(ast.dump(tree).encode("utf-8")).hexdigest()
+
+def cache_stats():
+    return _result_cache.stats()
+
+def run_code(code_input):
+    if WORKERS <= 0:
+        # 서버 프로세스에서 바로 실행하면 이전 실행이 바꾼 상태가 남아 있을 수 있어 캐시하지 않음
+        return _execute(code_input)
+    key = _cache_key(code_input)
+    if key is not None:
+        cached = _result_cache.get(key)
+        if cached is not None:
+            return cached
+    try:
+        result = get_pool().run(code_input)
+    except ExecutionAborted as e:
+        return str(e), "error"
+    output = result[0]
+    if (key is not None and len(output.encode("utf-8")) <= CACHE_MAX_OUTPUT
+            and not _ADDRESS_REPR.search(output)):
+        _result_cache.put(key, result)
+    return result
@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor, CancelledError, TimeoutError as FutureTimeout
+import threading
+import os
+from lazy import lazy_import
+
+keras = lazy_import("tensorflow.keras")
+
+# 동시에 학습할 수 있는 모델 수: 학습 하나가 CPU 코어를 여러 개 쓰므로 나머지 요청은 차례를 기다림
+WORKERS = int(os.environ.get("TRAINING_WORKERS", "2"))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="training")
+        return _executor
+
+class TrainingJob:
+    """스크립트 스레드 밖에서 모델을 학습하며 epoch마다 손실을 기록하는 작업"""
+
+    def __init__(self, key, target, *args, on_result=None):
+        self.key = key
+        self.losses = []
+        self._cancelled = threading.Event()
+        self._on_result = on_result
+        self._future = _get_executor().submit(self._run, target, args)
+
+    def _run(self, target, args):
+        result = target(*args, on_epoch_end=self.report)
+        # 취소되어 중간에 멈춘 모델은 저장하지 않음
+        if not self._cancelled.is_set() and self._on_result is not None:
+            self._on_result(result)
+        return result
+
+    def report(self, epoch, loss):
+        self.losses.append(float(loss))
+        return not self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+        self._future.cancel()
+
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def failed(self):
+        """학습이 예외로 끝났는지 여부"""
+        future = self._future
+        return future.done() and not future.cancelled() and future.exception() is not None
+
+    def wait(self, timeout=None):
+        try:
+            self._future.exception(timeout=timeout)
+        except FutureTimeout:
+            return False
+        except CancelledError:
+            pass
+        return True
+
+    def result(self):
+        return self._future.result()
+
+def cancel_stale(state, slot, key):
+    """세션에 남아 있는 작업이 다른 설정의 것이면 취소"""
+    job = state.get(slot)
+    if job is not None and job.key != key:
+        job.cancel()
+        del state[slot]
+
+def session_job(state, slot, key, target, *args, on_result=None):
+    """세션별로 하나의 학습 작업을 유지 (설정이 바뀌면 이전 작업은 취소하고 새로 시작)
+
+    예외로 끝난 작업은 세션에서 버리고 새로 시작하므로, 다시 실행하면 같은 설정으로 재시도할 수 있음
+    """
+    cancel_stale(state, slot, key)
+    job = state.get(slot)
+    if job is None or job.cancelled() or job.failed():
+        job = TrainingJob(key, target, *args, on_result=on_result)
+        state[slot] = job
+    return job
+
+def keras_progress_callback(on_epoch_end):
+    """on_epoch_end(epoch, loss)가 False를 반환하면 학습을 멈추는 Keras 콜백"""
+    callback = keras.callbacks.LambdaCallback()
+
+    def hook(epoch, logs=None):
+        if on_epoch_end(epoch, (logs or {}).get("loss", float("nan"))) is False:
+            callback.model.stop_training = True
+
+    callback.on_epoch_end = hook
+    return callback
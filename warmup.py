@@ -0,0 +1,87 @@
+import importlib
+import threading
+import time
+import os
+
+# 서버 시작 시 무거운 수업(6·7일차)을 미리 준비할지 여부 (WARMUP_HEAVY_LESSONS=1 일 때만)
+ENABLED = os.environ.get("WARMUP_HEAVY_LESSONS") == "1"
+HEAVY_LESSONS = ("data6", "data7")
+
+_lock = threading.Lock()
+_ready = threading.Event()
+_thread = None
+# 세션이 준비 완료를 기다리는 최대 시간(초), 넘으면 준비 없이 수업을 불러옴
+WAIT_TIMEOUT = 120
+_status = {"state": "idle", "steps": {}, "errors": {}}
+
+def _step(name, fn):
+    start = time.perf_counter()
+    try:
+        result = fn()
+    except Exception as e:
+        with _lock:
+            _status["errors"][name] = f"{e.__class__.__name__}: {e}"
+        return None
+    with _lock:
+        _status["steps"][name] = round(time.perf_counter() - start, 2)
+    return result
+
+def _register_font():
+    import fonts
+    fonts.register_korean_font()
+
+def _import_lessons():
+    for name in HEAVY_LESSONS:
+        importlib.import_module(name)
+
+def _build_keras_model():
+    # 텐서플로 초기화와 학습 그래프 생성을 한 번 거쳐 둡니다.
+    import numpy as np
+    keras = importlib.import_module("tensorflow.keras")
+    model = keras.models.Sequential([
+        keras.Input(shape=(1,)),
+        keras.layers.Dense(4, activation='tanh'),
+        keras.layers.Dense(1)
+    ])
+    model.compile(optimizer=keras.optimizers.Adam(0.01), loss='mse')
+    x = np.zeros((2, 1))
+    model.fit(x, x, epochs=1, verbose=0)
+    model.predict(x, verbose=0)
+    del model
+
+def _uses_keras():
+    # mlp는 numpy를 불러오므로 main.py가 import할 때가 아니라 준비 스레드에서 불러옴
+    import mlp
+    return mlp.DL_BACKEND != "numpy"
+
+def _run():
+    try:
+        _step("font", _register_font)
+        _step("lessons", _import_lessons)
+        if _step("backend", _uses_keras):
+            _step("keras", _build_keras_model)
+    finally:
+        # 어떤 단계가 실패해도 기다리는 세션이 멈추지 않도록 항상 끝을 알림
+        with _lock:
+            _status["state"] = "failed" if _status["errors"] else "ready"
+        _ready.set()
+
+def start():
+    """백그라운드 스레드에서 준비 작업을 시작 (여러 번 호출해도 한 번만 실행)"""
+    global _thread
+    with _lock:
+        if _thread is not None:
+            return
+        _status["state"] = "running"
+        _thread = threading.Thread(target=_run, name="lesson-warmup", daemon=True)
+        _thread.start()
+
+def is_ready():
+    return _ready.is_set()
+
+def wait(timeout=WAIT_TIMEOUT):
+    return _ready.wait(timeout)
+
+def status():
+    with _lock:
+        return {"state": _status["state"], "steps": dict(_status["steps"]), "errors": dict(_status["errors"])}